@@ -0,0 +1,187 @@
+#!/usr/bin/python3
+"""
+<https://adventofcode.com/2022/day/2> "Advent of Code - Day 2"
+
+# Advent of Code 2022 --- Day 2
+
+## Score trajectory analytics
+
+`get_total_score` gives one number for a whole guide. This follows the score
+round by round in a single streaming pass over the encoded rounds
+(`iter_round_codes`, or a packed guide from `packed.py`): the running total,
+the sum of every block of `window` rounds, and the best and worst run of
+`window` consecutive rounds anywhere in the guide.
+
+The sliding window sum is updated in constant time per round from a deque of
+the last `window` scores, so memory is O(window) however long the guide is.
+The per-block series is handed to a writer as it is produced, either a CSV
+file or a binary file of little-endian (rounds, block sum, running total)
+records.
+"""
+
+import argparse
+import csv
+import struct
+import sys
+from collections import deque
+from pathlib import Path
+
+import ch_1
+import ch_2
+from packed import HEADER, iter_packed_codes, read_packed
+
+SERIES_RECORD = struct.Struct("<QQQ")
+
+
+def iter_scores(codes, outcomes=False):
+    """Scores encoded rounds lazily
+
+    Args:
+        codes (Iterable[int]): Round codes, 3 * opponent + second column
+        outcomes (bool): Read the second column as outcomes (part two)
+
+    Returns:
+        Iterator[int]: Each round's score
+    """
+    table = ch_2.ROUND_SCORES if outcomes else ch_1.ROUND_SCORES
+    return map(table.__getitem__, codes)
+
+
+def analyze(scores, window=1000, on_block=None):
+    """Follows a guide's score round by round
+
+    Args:
+        scores (Iterable[int]): Round scores, consumed lazily
+        window (int): Rounds per block and per sliding window
+        on_block (func): Called with (rounds, block sum, running total) at
+          the end of every full block and of a final partial one
+
+    Returns:
+        dict: 'rounds' and 'total', and 'best' and 'worst' (first round,
+          sum) of the sliding windows, None if there are fewer than window
+          rounds
+    """
+    recent = deque(maxlen=window)
+    window_sum = 0
+    block_sum = 0
+    total = 0
+    rounds = 0
+    best = worst = None
+
+    for score in scores:
+        if len(recent) == window:
+            window_sum -= recent[0]  # Dropped by the append below
+        recent.append(score)
+        window_sum += score
+        block_sum += score
+        total += score
+        rounds += 1
+
+        if rounds >= window:
+            start = rounds - window + 1
+            if best is None or window_sum > best[1]:
+                best = (start, window_sum)
+            if worst is None or window_sum < worst[1]:
+                worst = (start, window_sum)
+        if rounds % window == 0:
+            if on_block:
+                on_block(rounds, block_sum, total)
+            block_sum = 0
+
+    if rounds % window and on_block:
+        on_block(rounds, block_sum, total)
+    return {'rounds': rounds, 'total': total, 'best': best, 'worst': worst}
+
+
+def read_binary_series(file_path):
+    """Reads a binary series written by `main`
+
+    Args:
+        file_path (str): Path to series
+
+    Returns:
+        list[tuple[int, int, int]]: (rounds, block sum, running total)
+    """
+    return list(SERIES_RECORD.iter_unpack(Path(file_path).read_bytes()))
+
+
+def main():
+    """Parses command line args, analyzes the guide and prints a summary"""
+    parser = argparse.ArgumentParser(
+        description="Rock Paper Scissor Score Trajectory",
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to "encrypted" input file, or a packed guide (.pack)',
+        default="./input.txt",
+    )
+    parser.add_argument(
+        "-w",
+        "--window",
+        help="rounds per block and per sliding window",
+        default=1000,
+        type=int,
+    )
+    parser.add_argument(
+        "--outcomes",
+        help="read the second column as outcomes (part two)",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="write the per-block series to this file",
+    )
+    parser.add_argument(
+        "--binary",
+        help="write the series as binary records instead of CSV",
+        action="store_true",
+    )
+    args = parser.parse_args()
+
+    if not Path(args.file).exists() or args.window < 1:
+        parser.print_usage()
+        sys.exit()
+
+    buffer = payload = None
+    if args.file.endswith(".pack"):
+        _, buffer = read_packed(args.file)
+        payload = memoryview(buffer)[HEADER.size:]
+        codes = iter_packed_codes(payload)
+    else:
+        codes = ch_1.iter_round_codes(ch_1.iter_input_file(args.file))
+    scores = iter_scores(codes, args.outcomes)
+
+    if args.output is None:
+        summary = analyze(scores, args.window)
+    elif args.binary:
+        with Path(args.output).open(mode="wb") as file:
+            summary = analyze(
+                scores, args.window,
+                lambda *row: file.write(SERIES_RECORD.pack(*row)),
+            )
+    else:
+        with Path(args.output).open(mode="w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(("rounds", "block_sum", "running_total"))
+            summary = analyze(
+                scores, args.window, lambda *row: writer.writerow(row)
+            )
+    if buffer is not None:
+        payload.release()
+        buffer.close()
+
+    # 11449 (13187 with --outcomes)
+    print(f"Total score: {summary['total']} over {summary['rounds']} rounds")
+    for name in ("best", "worst"):
+        if summary[name] is not None:
+            start, window_sum = summary[name]
+            print(
+                f"{name.capitalize()} {args.window} rounds: {window_sum} "
+                f"(rounds {start} to {start + args.window - 1})"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/python3
+"""
+<https://adventofcode.com/2022/day/2> "Advent of Code - Day 2"
+
+# Advent of Code 2022 --- Day 2
+
+## Bulk parser and count-once scoring
+
+`read_input_file` runs a regular expression, `strip` and `split` on every
+line. This parser maps the guide with `mmap` and reads it in chunks of
+fixed-width `A X\n` records. A chunk is validated with `bytes.translate`
+tables, one per byte offset of the record, and if every record is well formed
+the 9 possible records are counted with `bytes.count`, all without leaving C.
+A chunk holding a malformed record is walked record by record up to it, the
+malformed line is skipped as `read_input_file` would skip it, and the fast
+path resumes on the next line with a short chunk that doubles back up to full
+size while the records stay well formed.
+
+A round's score depends only on its (opponent, second column) pair, so the
+guide is reduced to a 3x3 matrix of pair counts, read once. Any decoding of
+the second column is then scored from the matrix in constant time: the shape
+decoding of part one, the outcome decoding of part two, and each of the 6 ways
+of assigning rock, paper and scissors to `X`, `Y` and `Z`.
+"""
+
+import argparse
+import mmap
+import os
+import sys
+import time
+from itertools import permutations
+from pathlib import Path
+
+import ch_1
+from vectorized import OUTCOME, SHAPE, TABLES
+
+CHUNK = 1 << 20  # Bytes per fast-path chunk, a multiple of 4
+MIN_SPAN = 256  # Bytes tried after a malformed line, doubled up to CHUNK
+RECORD = 4
+
+# Each valid record (without its newline) and its pair code, 3 * opponent +
+# column
+PAIRS = {
+    f"{opponent} {column}".encode(): 3 * row + index
+    for row, opponent in enumerate("ABC")
+    for index, column in enumerate("XYZ")
+}
+PATTERNS = [record + b"\n" for record in PAIRS]
+
+# Bytes allowed at each offset of a record
+ALLOWED = (b"ABC", b" ", b"XYZ", b"\n")
+
+
+def map_file(file_path):
+    """Returns a read-only memory map of a file (empty bytes if empty)
+
+    Args:
+        file_path (str): Path to input file
+
+    Returns:
+        Union[mmap.mmap, bytes]: Mapped file contents
+    """
+    with Path(file_path).open(mode='rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def is_well_formed(chunk):
+    """Returns True if a chunk is a run of valid fixed-width records
+
+    Args:
+        chunk (bytes): Bytes whose length is a multiple of 4
+
+    Returns:
+        bool: Every record is `[ABC] [XYZ]\\n`
+    """
+    view = memoryview(chunk)
+    # Deleting the allowed bytes at each offset leaves only invalid ones
+    return not any(
+        bytes(view[offset::RECORD]).translate(None, allowed)
+        for offset, allowed in enumerate(ALLOWED)
+    )
+
+
+def count_line(line, counts):
+    """Counts one line on the slow path
+
+    Args:
+        line (bytes): Line without its newline
+        counts (list[int]): Pair counts to update
+
+    Returns:
+        bool: True if the line was a valid round
+    """
+    pair = PAIRS.get(line.rstrip())
+    if pair is None:
+        return False
+    counts[pair] += 1
+    return True
+
+
+def count_pairs(buffer, start=0, stop=None):
+    """Counts each (opponent, second column) pair in a guide
+
+    Args:
+        buffer (Union[bytes, mmap.mmap]): Guide contents
+        start (int): Offset of the first line
+        stop (int): Offset to stop before, defaults to the end of buffer
+
+    Returns:
+        list[int]: counts[3 * opponent + column], codes 0 to 2
+    """
+    stop = len(buffer) if stop is None else stop
+    counts = [0] * 9
+    position = start
+    span = CHUNK
+    while position < stop:
+        chunk = buffer[position:min(position + span, stop)]
+        whole = len(chunk) - len(chunk) % RECORD
+        if whole and is_well_formed(chunk[:whole]):
+            found = whole // RECORD
+            for pair, pattern in enumerate(PATTERNS[:-1]):
+                count = chunk.count(pattern, 0, whole)
+                counts[pair] += count
+                found -= count
+            counts[-1] += found  # Every remaining record is the last pair
+            position += whole
+            span = min(span * 2, CHUNK)
+            if whole == len(chunk):
+                continue
+        else:
+            # Step over the valid records before the malformed line
+            offset = 0
+            while chunk[offset + RECORD - 1:offset + RECORD] == b"\n" \
+                    and count_line(chunk[offset:offset + 3], counts):
+                offset += RECORD
+            position += offset
+            # Retry the fast path on a short span after the malformed line,
+            # so a guide of malformed lines (CRLF endings) costs O(1) a line
+            span = MIN_SPAN
+
+        # Slow path: one line that is malformed or cut off by the chunk
+        newline = buffer.find(b"\n", position, stop)
+        end = stop if newline == -1 else newline
+        count_line(buffer[position:end].rstrip(b"\r"), counts)
+        position = end + 1
+    return counts
+
+
+def count_file(file_path):
+    """Memory-maps a guide and counts its pairs
+
+    Args:
+        file_path (str): Path to input file
+
+    Returns:
+        list[int]: See `count_pairs`
+    """
+    buffer = map_file(file_path)
+    try:
+        return count_pairs(buffer)
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+
+def get_shape_table(shapes):
+    """Returns the score table for a decoding of X, Y and Z as shapes
+
+    Args:
+        shapes (tuple[str]): Shapes X, Y and Z stand for
+
+    Returns:
+        list[list[int]]: table[opponent][column] score
+    """
+    return [
+        [ch_1.get_round_score(ch_1.translate(o), shape) for shape in shapes]
+        for o in "ABC"
+    ]
+
+
+def get_decodings():
+    """Returns every decoding of the second column with its score table
+
+    Returns:
+        dict[str, list[list[int]]]: SHAPE, OUTCOME and one entry per
+          permutation of shapes, e.g. 'XYZ=rock,paper,scissors'
+    """
+    decodings = {SHAPE: TABLES[SHAPE], OUTCOME: TABLES[OUTCOME]}
+    for shapes in permutations((ch_1.ROCK, ch_1.PAPER, ch_1.SCISSORS)):
+        decodings[f"XYZ={','.join(shapes)}"] = get_shape_table(shapes)
+    return decodings
+
+
+def score_counts(counts, table):
+    """Returns the total score of a guide from its pair counts
+
+    Args:
+        counts (list[int]): From `count_pairs`
+        table (list[list[int]]): Score table of a decoding
+
+    Returns:
+        int: Total score
+    """
+    return sum(
+        count * score
+        for count, score in zip(counts, (s for row in table for s in row))
+    )
+
+
+def main():
+    """Parses command line args and prints the score under every decoding"""
+    parser = argparse.ArgumentParser(
+        description="Count-once Rock Paper Scissor Score Counter",
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to "encrypted" input file',
+        default="./input.txt",
+    )
+    parser.add_argument(
+        "--benchmark",
+        help="also read the guide with read_input_file and compare times",
+        action="store_true",
+    )
+    args = parser.parse_args()
+
+    if not Path(args.file).exists():
+        parser.print_usage()
+        sys.exit()
+
+    start = time.perf_counter()
+    counts = count_file(args.file)
+    seconds = time.perf_counter() - start
+
+    print(f"Rounds: {sum(counts)}")
+    for name, table in get_decodings().items():
+        # shape: 11449, outcome: 13187
+        print(f"Total score ({name}): {score_counts(counts, table)}")
+
+    if args.benchmark:
+        start = time.perf_counter()
+        rounds = ch_1.read_input_file(args.file)
+        regex_seconds = time.perf_counter() - start
+        assert len(rounds) == sum(counts)
+        print(f"read_input_file: {regex_seconds:.3f}s")
+        print(f"mmap + count: {seconds:.3f}s")
+        print(f"Speedup: {regex_seconds / seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
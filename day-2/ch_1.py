@@ -64,6 +64,7 @@ strategy guide?**
 import argparse
 import re
 import sys
+from array import array
 from pathlib import Path
 
 PAPER = "paper"
@@ -74,6 +75,38 @@ DRAW = "draw"
 LOSE = "lose"
 WIN = "win"
 
+# Rounds are modelled with small integer codes. A shape's code is its index in
+# SHAPES and an outcome's its index in OUTCOMES, so a shape scores code + 1 and
+# an outcome 3 * code. Each shape beats the one before it, modulo 3.
+SHAPES = (ROCK, PAPER, SCISSORS)
+OUTCOMES = (LOSE, DRAW, WIN)
+SHAPE_CODES = {shape: code for code, shape in enumerate(SHAPES)}
+OUTCOME_CODES = {outcome: code for code, outcome in enumerate(OUTCOMES)}
+
+# Both columns of the guide, encoded as 0 to 2
+LETTER_CODES = {'A': 0, 'B': 1, 'C': 2, 'X': 0, 'Y': 1, 'Z': 2}
+
+
+def get_outcome_code(opponent_code, code):
+    """Returns the outcome code of throwing one shape against another
+
+    Args:
+        opponent_code (int): Opponent's shape code
+        code (int): Own shape code
+
+    Returns:
+        int: 0 (lose), 1 (draw) or 2 (win)
+    """
+    return (code - opponent_code + 1) % 3
+
+
+# Score of every round by code, 3 * opponent shape code + own shape code
+ROUND_SCORES = array('B', (
+    code + 1 + 3 * get_outcome_code(opponent_code, code)
+    for opponent_code in range(3)
+    for code in range(3)
+))
+
 
 def get_base_score(outcome):
     """Returns a score based on outcome or None
@@ -84,13 +117,8 @@ def get_base_score(outcome):
     Returns:
         6, 3, 0 or None
     """
-    if outcome == WIN:
-        return 6
-    if outcome == DRAW:
-        return 3
-    if outcome == LOSE:
-        return 0
-    return None
+    code = OUTCOME_CODES.get(outcome)
+    return None if code is None else 3 * code
 
 
 def get_shape_score(shape):
@@ -102,13 +130,8 @@ def get_shape_score(shape):
     Returns:
         3, 2, 1, or None
     """
-    if shape == SCISSORS:
-        return 3
-    if shape == PAPER:
-        return 2
-    if shape == ROCK:
-        return 1
-    return None
+    code = SHAPE_CODES.get(shape)
+    return None if code is None else code + 1
 
 
 def get_losing_throw(throw):
@@ -120,13 +143,8 @@ def get_losing_throw(throw):
     Returns:
         Losing throw ('paper', 'scissors', or 'rock') or None
     """
-    if throw == PAPER:
-        return ROCK
-    if throw == ROCK:
-        return SCISSORS
-    if throw == SCISSORS:
-        return PAPER
-    return None
+    code = SHAPE_CODES.get(throw)
+    return None if code is None else SHAPES[(code - 1) % 3]
 
 
 def get_round_score(opponent_throw, throw):
@@ -139,27 +157,23 @@ def get_round_score(opponent_throw, throw):
     Returns:
         int: Total score for the current round
     """
-    outcome = rock_paper_scissors(throw, opponent_throw)
-    base_score = get_base_score(outcome)
-    shape_score = get_shape_score(throw)
-    return base_score + shape_score
+    return ROUND_SCORES[3 * SHAPE_CODES[opponent_throw] + SHAPE_CODES[throw]]
 
 
 def get_total_score(rounds):
     """Returns total score tabulated from a list of rounds
 
     Args:
-        rounds (list[list[str]]): A list of rounds (each a list of throws)
+        rounds (Iterable[list[str]]): Rounds (each a list of throws),
+          consumed lazily
 
     Returns:
         int: Total score for the list of rounds
     """
-    total_score = 0
-    for single_round in rounds:
-        opponent_throw, throw = single_round
-        round_score = get_round_score(opponent_throw, throw)
-        total_score += round_score
-    return total_score
+    return sum(
+        get_round_score(opponent_throw, throw)
+        for opponent_throw, throw in rounds
+    )
 
 
 def rock_paper_scissors(throw, counter):
@@ -174,17 +188,11 @@ def rock_paper_scissors(throw, counter):
     Returns:
         str: 'win', 'lose', or 'draw' based on the input
     """
-    if throw == counter:
-        return DRAW
-
-    losing_throw = get_losing_throw(counter)
-    if throw == losing_throw:
-        return LOSE
-
-    winning_throw = get_losing_throw(losing_throw)
-    if throw == winning_throw:
-        return WIN
-    return None
+    code = SHAPE_CODES.get(throw)
+    counter_code = SHAPE_CODES.get(counter)
+    if code is None or counter_code is None:
+        return None
+    return OUTCOMES[get_outcome_code(counter_code, code)]
 
 
 def translate(to_translate):
@@ -205,6 +213,20 @@ def translate(to_translate):
     return None
 
 
+def iter_translated_rounds(rounds_input):
+    """Lazily transforms input rounds, one at a time
+
+    Args:
+        rounds_input (Iterable[list[str]]): "Encrypted" round input
+
+    Yields:
+        list[str]: Each translated round
+    """
+    for round_input in rounds_input:
+        opponent, throw = round_input
+        yield [translate(opponent), translate(throw)]
+
+
 def translate_rounds(rounds_input):
     """Transforms a list of input rounds
 
@@ -214,11 +236,60 @@ def translate_rounds(rounds_input):
     Returns:
         list[list(str)]: A list of translated rounds
     """
-    translated = []
-    for round_input in rounds_input:
-        opponent, throw = round_input
-        translated.append([translate(opponent), translate(throw)])
-    return translated
+    return list(iter_translated_rounds(rounds_input))
+
+
+def iter_round_codes(rounds_input):
+    """Lazily encodes input rounds as one integer code each
+
+    Args:
+        rounds_input (Iterable[list[str]]): "Encrypted" round input
+
+    Yields:
+        int: 3 * opponent code + second column code, 0 to 8
+    """
+    for opponent, throw in rounds_input:
+        yield 3 * LETTER_CODES[opponent] + LETTER_CODES[throw]
+
+
+def encode_rounds(rounds_input):
+    """Encodes input rounds compactly, one byte per round
+
+    Args:
+        rounds_input (Iterable[list[str]]): "Encrypted" round input
+
+    Returns:
+        array: Codes from `iter_round_codes`
+    """
+    return array('B', iter_round_codes(rounds_input))
+
+
+def score_rounds(codes):
+    """Returns total score of encoded rounds by table lookup
+
+    Args:
+        codes (Iterable[int]): Codes from `iter_round_codes`
+
+    Returns:
+        int: Total score for the rounds
+    """
+    return sum(map(ROUND_SCORES.__getitem__, codes))
+
+
+def iter_input_file(file_path):
+    """Lazily reads round data inputs from file, one line at a time
+
+    Args:
+        file_path (str): Path to input file
+
+    Yields:
+        list[str]: Each round data input
+    """
+    with Path(file_path).open(mode='r', encoding='utf-8') as file:
+        for line in file:
+            if re.match("[ABC] [XYZ]", line):
+                throw, encrypted_throw = line.strip().split(' ')
+                yield [throw, encrypted_throw]
 
 
 def read_input_file(file_path):
@@ -230,14 +301,7 @@ def read_input_file(file_path):
     Returns:
         list[list[str]]: A list of round data inputs
     """
-    with Path(file_path).open(mode='r', encoding='utf-8') as file:
-        lines = file.readlines()
-        rounds = []
-        for line in lines:
-            if re.match("[ABC] [XYZ]", line):
-                throw, encrypted_throw = line.strip().split(' ')
-                rounds.append([throw, encrypted_throw])
-        return rounds
+    return list(iter_input_file(file_path))
 
 
 def main():
@@ -257,9 +321,9 @@ def main():
         parser.print_usage()
         sys.exit()
 
-    rounds = read_input_file(args.file)
-    translated = translate_rounds(rounds)
-    total_score = get_total_score(translated)
+    # Rounds are read, encoded and scored one at a time
+    rounds = iter_input_file(args.file)
+    total_score = score_rounds(iter_round_codes(rounds))
 
     print(f"Total score: {total_score}") # 11449
 
@@ -33,6 +33,7 @@ score be if everything goes exactly according to your strategy guide?**
 import argparse
 import re
 import sys
+from array import array
 from pathlib import Path
 
 PAPER = "paper"
@@ -43,6 +44,42 @@ DRAW = "draw"
 LOSE = "lose"
 WIN = "win"
 
+# Rounds are modelled with small integer codes. A shape's code is its index in
+# SHAPES and an outcome's its index in OUTCOMES, so a shape scores code + 1 and
+# an outcome 3 * code. Each shape beats the one before it, modulo 3.
+SHAPES = (ROCK, PAPER, SCISSORS)
+OUTCOMES = (LOSE, DRAW, WIN)
+SHAPE_CODES = {shape: code for code, shape in enumerate(SHAPES)}
+OUTCOME_CODES = {outcome: code for code, outcome in enumerate(OUTCOMES)}
+
+# Both columns of the guide, encoded as 0 to 2
+LETTER_CODES = {'A': 0, 'B': 1, 'C': 2, 'X': 0, 'Y': 1, 'Z': 2}
+
+
+def get_required_code(opponent_code, outcome_code):
+    """Returns the shape code that gives an outcome against a shape
+
+    Args:
+        opponent_code (int): Opponent's shape code
+        outcome_code (int): 0 (lose), 1 (draw) or 2 (win)
+
+    Returns:
+        int: Shape code to throw
+    """
+    return (opponent_code + outcome_code - 1) % 3
+
+
+# Shape code to throw and score of every round by code, 3 * opponent shape
+# code + outcome code
+REQUIRED_THROWS = array('B', (
+    get_required_code(opponent_code, outcome_code)
+    for opponent_code in range(3)
+    for outcome_code in range(3)
+))
+ROUND_SCORES = array('B', (
+    REQUIRED_THROWS[code] + 1 + 3 * (code % 3) for code in range(9)
+))
+
 
 def get_base_score(outcome):
     """Returns a score based on outcome or None
@@ -53,13 +90,8 @@ def get_base_score(outcome):
     Returns:
         6, 3, 0 or None
     """
-    if outcome == WIN:
-        return 6
-    if outcome == DRAW:
-        return 3
-    if outcome == LOSE:
-        return 0
-    return None
+    code = OUTCOME_CODES.get(outcome)
+    return None if code is None else 3 * code
 
 
 def get_shape_score(shape):
@@ -71,13 +103,8 @@ def get_shape_score(shape):
     Returns:
         3, 2, 1, or None
     """
-    if shape == SCISSORS:
-        return 3
-    if shape == PAPER:
-        return 2
-    if shape == ROCK:
-        return 1
-    return None
+    code = SHAPE_CODES.get(shape)
+    return None if code is None else code + 1
 
 
 def get_round_score(opponent_throw, outcome):
@@ -90,28 +117,24 @@ def get_round_score(opponent_throw, outcome):
     Returns:
         int: Total score for the current round
     """
-
-    base_score = get_base_score(outcome)
-    shape = get_required_throw(opponent_throw, outcome)
-    shape_score = get_shape_score(shape)
-    return base_score + shape_score
+    code = 3 * SHAPE_CODES[opponent_throw] + OUTCOME_CODES[outcome]
+    return ROUND_SCORES[code]
 
 
 def get_total_score(rounds):
     """Returns total score tabulated from a list of rounds
 
     Args:
-        rounds (list[list[str]]): A list of rounds (each a list of throws)
+        rounds (Iterable[list[str]]): Rounds (each a list of throws),
+          consumed lazily
 
     Returns:
         int: Total score for the list of rounds
     """
-    total_score = 0
-    for single_round in rounds:
-        opponent_throw, outcome = single_round
-        round_score = get_round_score(opponent_throw, outcome)
-        total_score += round_score
-    return total_score
+    return sum(
+        get_round_score(opponent_throw, outcome)
+        for opponent_throw, outcome in rounds
+    )
 
 
 def get_losing_throw(throw):
@@ -123,13 +146,8 @@ def get_losing_throw(throw):
     Returns:
         Losing throw ('paper', 'scissors', or 'rock') or None
     """
-    if throw == PAPER:
-        return ROCK
-    if throw == ROCK:
-        return SCISSORS
-    if throw == SCISSORS:
-        return PAPER
-    return None
+    code = SHAPE_CODES.get(throw)
+    return None if code is None else SHAPES[(code - 1) % 3]
 
 
 def get_required_throw(opponent_throw, outcome):
@@ -142,14 +160,11 @@ def get_required_throw(opponent_throw, outcome):
     Returns:
         str: 'paper', 'scissors', or 'rock' based on input
     """
-    if outcome == DRAW:
-        return opponent_throw
-    loses = get_losing_throw(opponent_throw)
-    if outcome == LOSE:
-        return loses
-    if outcome == WIN:
-        return get_losing_throw(loses)
-    return None
+    opponent_code = SHAPE_CODES.get(opponent_throw)
+    outcome_code = OUTCOME_CODES.get(outcome)
+    if opponent_code is None or outcome_code is None:
+        return None
+    return SHAPES[REQUIRED_THROWS[3 * opponent_code + outcome_code]]
 
 
 def translate(to_translate):
@@ -174,6 +189,20 @@ def translate(to_translate):
     return switch.get(to_translate, None)
 
 
+def iter_translated_rounds(rounds_input):
+    """Lazily transforms input rounds, one at a time
+
+    Args:
+        rounds_input (Iterable[list[str]]): "Encrypted" round input
+
+    Yields:
+        list[str]: Each translated round
+    """
+    for round_input in rounds_input:
+        opponent, required_outcome = round_input
+        yield [translate(opponent), translate(required_outcome)]
+
+
 def translate_rounds(rounds_input):
     """Transforms a list of input rounds
 
@@ -183,11 +212,60 @@ def translate_rounds(rounds_input):
     Returns:
         list[list(str)]: A list of translated rounds
     """
-    translated = []
-    for round_input in rounds_input:
-        opponent, required_outcome = round_input
-        translated.append([translate(opponent), translate(required_outcome)])
-    return translated
+    return list(iter_translated_rounds(rounds_input))
+
+
+def iter_round_codes(rounds_input):
+    """Lazily encodes input rounds as one integer code each
+
+    Args:
+        rounds_input (Iterable[list[str]]): "Encrypted" round input
+
+    Yields:
+        int: 3 * opponent code + second column code, 0 to 8
+    """
+    for opponent, required_outcome in rounds_input:
+        yield 3 * LETTER_CODES[opponent] + LETTER_CODES[required_outcome]
+
+
+def encode_rounds(rounds_input):
+    """Encodes input rounds compactly, one byte per round
+
+    Args:
+        rounds_input (Iterable[list[str]]): "Encrypted" round input
+
+    Returns:
+        array: Codes from `iter_round_codes`
+    """
+    return array('B', iter_round_codes(rounds_input))
+
+
+def score_rounds(codes):
+    """Returns total score of encoded rounds by table lookup
+
+    Args:
+        codes (Iterable[int]): Codes from `iter_round_codes`
+
+    Returns:
+        int: Total score for the rounds
+    """
+    return sum(map(ROUND_SCORES.__getitem__, codes))
+
+
+def iter_input_file(file_path):
+    """Lazily reads round data inputs from file, one line at a time
+
+    Args:
+        file_path (str): Path to input file
+
+    Yields:
+        list[str]: Each round data input
+    """
+    with Path(file_path).open(encoding='utf-8', mode='r') as file:
+        for line in file:
+            if re.match("[ABC] [XYZ]", line):
+                throw, encrypted_throw = line.strip().split(' ')
+                yield [throw, encrypted_throw]
 
 
 def read_input_file(file_path):
@@ -199,14 +277,7 @@ def read_input_file(file_path):
     Returns:
         list[list[str]]: A list of round data inputs
     """
-    with Path(file_path).open(encoding='utf-8', mode='r') as file:
-        lines = file.readlines()
-        rounds = []
-        for line in lines:
-            if re.match("[ABC] [XYZ]", line):
-                throw, encrypted_throw = line.strip().split(' ')
-                rounds.append([throw, encrypted_throw])
-        return rounds
+    return list(iter_input_file(file_path))
 
 
 def main():
@@ -226,9 +297,9 @@ def main():
         parser.print_usage()
         sys.exit()
 
-    rounds = read_input_file(args.file)
-    translated = translate_rounds(rounds)
-    total_score = get_total_score(translated)
+    # Rounds are read, encoded and scored one at a time
+    rounds = iter_input_file(args.file)
+    total_score = score_rounds(iter_round_codes(rounds))
 
     print(f"Total score: {total_score}") # 13187
 
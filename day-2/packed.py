@@ -0,0 +1,267 @@
+#!/usr/bin/python3
+"""
+<https://adventofcode.com/2022/day/2> "Advent of Code - Day 2"
+
+# Advent of Code 2022 --- Day 2
+
+## Packed binary guides
+
+A round is one of 9 (opponent, second column) pairs, so it fits in 4 bits.
+This converts a text guide to a packed format holding two rounds per byte,
+and scores packed guides without any text parsing.
+
+```
+header   magic, version, round count, CRC-32 of the rounds, source size,
+         source mtime (ns), CRC-32 of the source's absolute path
+rounds   uint8 x ceil(count / 2)
+```
+
+Numbers are little-endian. Each round is coded `3 * opponent + column`, as in
+`ch_1.iter_round_codes`; the first round of a byte is its low nibble and the
+second its high nibble, which is 0xF after an odd final round. A text round
+takes 4 bytes (`A X\n`) and a packed one half a byte, 8 times smaller.
+
+The reader maps the file, checks the CRC-32, and splits the bytes into their
+low and high nibbles with `bytes.translate`. Counting each code with
+`bytes.count` then gives the 3x3 pair counts of `bulk.py`, from which any
+decoding is scored. `main` repacks a packed guide whose header does not match
+the text guide given with `--file`, so it never scores a stale packing.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from itertools import islice
+from pathlib import Path
+
+import ch_1
+from bulk import count_file, score_counts
+from vectorized import OUTCOME, SHAPE, TABLES
+
+MAGIC = b"AOC2PACK"
+VERSION = 2
+HEADER = struct.Struct("<8sIQIQqI")
+PADDING = 0xF  # High nibble after an odd final round
+BATCH = 1 << 20  # Rounds packed at a time
+
+LOW_NIBBLES = bytes(value & 0xF for value in range(256))
+HIGH_NIBBLES = bytes(value >> 4 for value in range(256))
+
+
+def pack_codes(codes):
+    """Packs round codes two to a byte
+
+    Args:
+        codes (array): Round codes, 0 to 8
+
+    Returns:
+        bytes: Packed rounds
+    """
+    if len(codes) % 2:
+        codes = codes + array("B", [PADDING])
+    return bytes(
+        low | high << 4 for low, high in zip(codes[0::2], codes[1::2])
+    )
+
+
+def get_source(file_path):
+    """Identifies a text guide by its size, mtime and path
+
+    Args:
+        file_path (str): Path to text guide
+
+    Returns:
+        tuple[int, int, int]: (size, mtime in nanoseconds, CRC-32 of the
+          absolute path)
+    """
+    stat = os.stat(file_path)
+    path = os.path.abspath(file_path).encode()
+    return stat.st_size, stat.st_mtime_ns, zlib.crc32(path)
+
+
+def read_source(packed_path):
+    """Reads which text guide a packed guide was written from
+
+    Args:
+        packed_path (str): Path to packed guide
+
+    Returns:
+        Union[tuple[int, int, int], None]: See `get_source`, None if the
+          file is not a packed guide of this version
+    """
+    with Path(packed_path).open(mode="rb") as file:
+        header = file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    magic, version, _, _, *source = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return tuple(source)
+
+
+def write_packed(file_path, packed_path):
+    """Converts a text guide to a packed guide
+
+    Reads the rounds `read_input_file` accepts, one batch at a time.
+
+    Args:
+        file_path (str): Path to text guide
+        packed_path (str): Destination file
+
+    Returns:
+        int: Rounds written
+    """
+    source = get_source(file_path)
+    codes = ch_1.iter_round_codes(ch_1.iter_input_file(file_path))
+    rounds = 0
+    checksum = 0
+    with Path(packed_path).open(mode="wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, 0, *source))
+        while True:
+            batch = array("B", islice(codes, BATCH))
+            if not batch:
+                break
+            packed = pack_codes(batch)
+            checksum = zlib.crc32(packed, checksum)
+            file.write(packed)
+            rounds += len(batch)
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, rounds, checksum, *source))
+    return rounds
+
+
+def read_packed(packed_path):
+    """Maps a packed guide and checks its header and checksum
+
+    Args:
+        packed_path (str): Path to packed guide
+
+    Returns:
+        tuple[int, mmap.mmap]: Round count and the mapped file, whose rounds
+          start at HEADER.size
+    """
+    with Path(packed_path).open(mode="rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) < HEADER.size:
+        buffer.close()
+        raise ValueError(f"{packed_path} is not a packed guide")
+    magic, version, rounds, checksum, *_ = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != VERSION:
+        buffer.close()
+        raise ValueError(f"{packed_path} is not a packed guide")
+    with memoryview(buffer)[HEADER.size:] as payload:
+        intact = len(payload) == (rounds + 1) // 2 \
+            and zlib.crc32(payload) == checksum
+    if not intact:
+        buffer.close()
+        raise ValueError(f"{packed_path} is corrupt")
+    return rounds, buffer
+
+
+def iter_packed_codes(payload):
+    """Yields round codes from packed rounds, in order
+
+    Args:
+        payload (bytes-like): Packed rounds
+
+    Yields:
+        int: Each round code, 0 to 8
+    """
+    for value in payload:
+        yield value & 0xF
+        if value >> 4 != PADDING:
+            yield value >> 4
+
+
+def count_packed(packed_path):
+    """Counts each (opponent, second column) pair in a packed guide
+
+    Args:
+        packed_path (str): Path to packed guide
+
+    Returns:
+        list[int]: counts[3 * opponent + column], as `bulk.count_pairs`
+    """
+    rounds, buffer = read_packed(packed_path)
+    counts = [0] * 9
+    try:
+        position = HEADER.size
+        while position < len(buffer):
+            chunk = buffer[position:position + BATCH]
+            for nibbles in (LOW_NIBBLES, HIGH_NIBBLES):
+                codes = chunk.translate(nibbles)
+                for code in range(9):
+                    counts[code] += codes.count(code)
+            position += BATCH
+    finally:
+        buffer.close()
+    if sum(counts) != rounds:
+        raise ValueError(f"{packed_path} is corrupt")
+    return counts
+
+
+def main():
+    """Parses command line args, packs the guide if needed and prints both
+    total scores from the packed guide"""
+    parser = argparse.ArgumentParser(
+        description="Packed Rock Paper Scissor Score Counter",
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to "encrypted" input file',
+        default="./input.txt",
+    )
+    parser.add_argument(
+        "-p",
+        "--packed",
+        help="packed guide to score, written from --file if missing or stale",
+        default="./input.pack",
+    )
+    parser.add_argument(
+        "--rebuild",
+        help="rewrite the packed guide even if it exists",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--benchmark",
+        help="also count the text guide with bulk.py and compare times",
+        action="store_true",
+    )
+    args = parser.parse_args()
+
+    if not Path(args.file).exists():
+        parser.print_usage()
+        sys.exit()
+
+    if args.rebuild or not Path(args.packed).exists() \
+            or read_source(args.packed) != get_source(args.file):
+        start = time.perf_counter()
+        rounds = write_packed(args.file, args.packed)
+        print(
+            f"Packed {rounds} rounds into {os.path.getsize(args.packed)} "
+            f"bytes ({os.path.getsize(args.file)} as text) in "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+
+    start = time.perf_counter()
+    counts = count_packed(args.packed)
+    seconds = time.perf_counter() - start
+
+    print(f"Total score (shapes): {score_counts(counts, TABLES[SHAPE])}")
+    print(f"Total score (outcomes): {score_counts(counts, TABLES[OUTCOME])}")
+
+    if args.benchmark:
+        start = time.perf_counter()
+        assert count_file(args.file) == counts
+        print(f"Text guide (bulk.py): {time.perf_counter() - start:.3f}s")
+        print(f"Packed guide: {seconds:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
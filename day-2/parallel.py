@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+"""
+<https://adventofcode.com/2022/day/2> "Advent of Code - Day 2"
+
+# Advent of Code 2022 --- Day 2
+
+## Parallel scoring
+
+Rounds are independent, so a guide is split into line-aligned byte ranges
+and each range is counted by `bulk.count_pairs` in a process pool. Workers map
+the file themselves and are only sent (path, start, stop), so no rounds are
+pickled in either direction: each worker sends back its 9 pair counts. The
+counts are summed, and both parts' totals and their win, draw and lose counts
+are read off the summed matrix.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import ch_1
+from bulk import count_file, count_pairs, map_file, score_counts
+from vectorized import OUTCOME, SHAPE, TABLES
+
+
+def split_offsets(buffer, chunks):
+    """Returns line-aligned (start, stop) byte ranges covering a buffer
+
+    Args:
+        buffer (Union[bytes, mmap.mmap]): Guide contents
+        chunks (int): Number of ranges wanted
+
+    Returns:
+        list[tuple[int, int]]: Non-empty ranges in file order
+    """
+    size = len(buffer)
+    offsets = [0]
+    for chunk in range(1, chunks):
+        offset = buffer.find(b"\n", max(size * chunk // chunks, offsets[-1]))
+        if offset == -1:
+            break
+        offsets.append(offset + 1)
+    offsets.append(size)
+    return [
+        (start, stop) for start, stop in zip(offsets, offsets[1:])
+        if start < stop
+    ]
+
+
+def count_range(file_path, start, stop):
+    """Counts the pairs in one byte range of a guide
+
+    Args:
+        file_path (str): Path to input file
+        start (int): Offset of first line
+        stop (int): Offset to stop before
+
+    Returns:
+        list[int]: See `bulk.count_pairs`
+    """
+    buffer = map_file(file_path)
+    try:
+        return count_pairs(buffer, start, stop)
+    finally:
+        if not isinstance(buffer, bytes):
+            buffer.close()
+
+
+def count_parallel(file_path, jobs=None):
+    """Counts the pairs in a guide in a process pool
+
+    Args:
+        file_path (str): Path to input file
+        jobs (int): Worker processes, defaults to the CPU count
+
+    Returns:
+        list[int]: See `bulk.count_pairs`
+    """
+    jobs = jobs or os.cpu_count() or 1
+    buffer = map_file(file_path)
+    ranges = split_offsets(buffer, jobs * 4)
+    if not isinstance(buffer, bytes):
+        buffer.close()
+
+    counts = [0] * 9
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for partial in executor.map(
+            count_range,
+            [file_path] * len(ranges),
+            [start for start, _ in ranges],
+            [stop for _, stop in ranges],
+        ):
+            counts = [a + b for a, b in zip(counts, partial)]
+    return counts
+
+
+def get_outcome_counts(counts, interpretation=SHAPE):
+    """Returns how many rounds are won, drawn and lost
+
+    Args:
+        counts (list[int]): From `bulk.count_pairs`
+        interpretation (str): SHAPE (part one) or OUTCOME (part two)
+
+    Returns:
+        dict[str, int]: Rounds per 'win', 'draw' and 'lose'
+    """
+    outcomes = {ch_1.WIN: 0, ch_1.DRAW: 0, ch_1.LOSE: 0}
+    for pair, count in enumerate(counts):
+        opponent, column = divmod(pair, 3)
+        # A score is a shape score of 1 to 3 plus an outcome score of 0, 3
+        # or 6, so the outcome is recovered from the score alone
+        score = TABLES[interpretation][opponent][column]
+        outcome = (ch_1.LOSE, ch_1.DRAW, ch_1.WIN)[(score - 1) // 3]
+        outcomes[outcome] += count
+    return outcomes
+
+
+def main():
+    """Parses command line args and prints both totals from a parallel count"""
+    parser = argparse.ArgumentParser(
+        description="Parallel Rock Paper Scissor Score Counter",
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to "encrypted" input file',
+        default="./input.txt",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="worker processes (default: CPU count)",
+        type=int,
+    )
+    parser.add_argument(
+        "--check",
+        help="also count serially and compare times",
+        action="store_true",
+    )
+    args = parser.parse_args()
+
+    if not Path(args.file).exists():
+        parser.print_usage()
+        sys.exit()
+
+    start = time.perf_counter()
+    counts = count_parallel(args.file, args.jobs)
+    print(f"Parallel count: {time.perf_counter() - start:.2f}s")
+
+    if args.check:
+        start = time.perf_counter()
+        assert count_file(args.file) == counts
+        print(f"Serial count: {time.perf_counter() - start:.2f}s")
+
+    for name, interpretation in (("shapes", SHAPE), ("outcomes", OUTCOME)):
+        outcomes = get_outcome_counts(counts, interpretation)
+        # shapes: 11449, outcomes: 13187
+        print(
+            f"Total score ({name}): "
+            f"{score_counts(counts, TABLES[interpretation])} "
+            f"({outcomes[ch_1.WIN]} won, {outcomes[ch_1.DRAW]} drawn, "
+            f"{outcomes[ch_1.LOSE]} lost)"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/python3
+"""
+<https://adventofcode.com/2022/day/2> "Advent of Code - Day 2"
+
+# Advent of Code 2022 --- Day 2
+
+## Tournament leaderboard
+
+Scores a whole tournament: a directory holding one guide per player, named
+after the player (`alice.txt`, or `alice.pack` for a packed guide). Guides are
+handed to a shared process pool in batches, so each task amortizes its
+interprocess overhead over many files and workers spend their time reading.
+Each guide is reduced to its 3x3 pair counts by `bulk.py` (or `packed.py`),
+which give both the player's score and their win, draw and loss counts.
+
+Results are taken as batches finish. A min-heap bounded at k entries keeps the
+leaderboard, which can be printed as it changes, and a guide that cannot be
+read is reported without stopping the tournament.
+"""
+
+import argparse
+import heapq
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import ch_1
+from bulk import count_file, score_counts
+from packed import count_packed
+from parallel import get_outcome_counts
+from vectorized import OUTCOME, SHAPE, TABLES
+
+GUIDE_SUFFIXES = (".txt", ".pack")
+
+
+def count_guide(file_path):
+    """Counts the pairs in a text or packed guide
+
+    Args:
+        file_path (str): Path to guide
+
+    Returns:
+        list[int]: See `bulk.count_pairs`
+    """
+    if file_path.endswith(".pack"):
+        return count_packed(file_path)
+    return count_file(file_path)
+
+
+def count_batch(file_paths):
+    """Counts the pairs in each of a batch of guides
+
+    Args:
+        file_paths (list[str]): Paths to guides
+
+    Returns:
+        list[tuple[str, Union[list[int], str]]]: Each path with its counts,
+          or with an error message if it could not be read
+    """
+    results = []
+    for file_path in file_paths:
+        try:
+            results.append((file_path, count_guide(file_path)))
+        except (OSError, ValueError) as error:
+            results.append((file_path, str(error)))
+    return results
+
+
+class Leaderboard():
+    """Class Leaderboard keeps the k highest scores of a tournament
+
+    Attributes:
+        heap (list[tuple[int, str]]): Min-heap of (score, player)
+        k (int): Players kept
+    """
+
+    def __init__(self, k=10):
+        """Constructor
+
+        Args:
+            k (int): Players kept
+        """
+        self.heap = []
+        self.k = k
+
+    def add(self, player, score):
+        """Offers a player's score to the leaderboard
+
+        Args:
+            player (str): Player name
+            score (int): Total score
+
+        Returns:
+            bool: True if the player made the leaderboard
+        """
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, (score, player))
+            return True
+        if self.heap and (score, player) > self.heap[0]:  # Empty if k is 0
+            heapq.heapreplace(self.heap, (score, player))
+            return True
+        return False
+
+    def standings(self):
+        """Returns the leaderboard, highest score first
+
+        Returns:
+            list[tuple[int, str]]: (score, player) pairs
+        """
+        return sorted(self.heap, reverse=True)
+
+
+def iter_guides(directory):
+    """Lists the guides in a directory in name order
+
+    Args:
+        directory (str): Tournament directory
+
+    Returns:
+        list[str]: Paths to guides
+    """
+    with os.scandir(directory) as entries:
+        return sorted(
+            entry.path for entry in entries
+            if entry.is_file() and entry.name.endswith(GUIDE_SUFFIXES)
+        )
+
+
+def run_tournament(
+    directory, interpretation=SHAPE, k=10, jobs=None, batch=64,
+    on_change=None,
+):
+    """Scores every guide in a directory
+
+    Args:
+        directory (str): Tournament directory
+        interpretation (str): SHAPE (part one) or OUTCOME (part two)
+        k (int): Leaderboard size
+        jobs (int): Worker processes, defaults to the CPU count
+        batch (int): Guides per task
+        on_change (func): Called with the leaderboard whenever it changes
+
+    Returns:
+        tuple[Leaderboard, dict[str, dict[str, int]]]: Leaderboard and each
+          player's 'win', 'draw' and 'lose' counts
+    """
+    guides = iter_guides(directory)
+    leaderboard = Leaderboard(k)
+    outcomes = {}
+    table = TABLES[interpretation]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(count_batch, guides[start:start + batch])
+            for start in range(0, len(guides), batch)
+        ]
+        for future in as_completed(futures):
+            for file_path, counts in future.result():
+                if isinstance(counts, str):  # Report it and keep going
+                    print(f"{file_path}: failed ({counts})", file=sys.stderr)
+                    continue
+                player = Path(file_path).stem
+                outcomes[player] = get_outcome_counts(counts, interpretation)
+                if leaderboard.add(player, score_counts(counts, table)) \
+                        and on_change:
+                    on_change(leaderboard)
+    return leaderboard, outcomes
+
+
+def format_record(outcomes):
+    """Returns a player's record as 'W-D-L'"""
+    return (
+        f"{outcomes[ch_1.WIN]}-{outcomes[ch_1.DRAW]}-{outcomes[ch_1.LOSE]}"
+    )
+
+
+def main():
+    """Parses command line args, runs the tournament and prints the
+    leaderboard"""
+    parser = argparse.ArgumentParser(
+        description="Rock Paper Scissor Tournament Leaderboard",
+    )
+    parser.add_argument(
+        "directory",
+        help="directory of guides, one per player",
+        nargs="?",
+        default=".",
+    )
+    parser.add_argument(
+        "-k",
+        "--top",
+        help="number of players on the leaderboard",
+        default=10,
+        type=int,
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="worker processes (default: CPU count)",
+        type=int,
+    )
+    parser.add_argument(
+        "--outcomes",
+        help="read the second column as outcomes (part two)",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--live",
+        help="print the leader each time it changes",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--all",
+        help="print every player's win-draw-loss record",
+        action="store_true",
+    )
+    args = parser.parse_args()
+
+    if not Path(args.directory).is_dir() or args.top < 1:
+        parser.print_usage()
+        sys.exit()
+
+    leader = None
+
+    def print_leader(leaderboard):
+        nonlocal leader
+        score, player = max(leaderboard.heap)
+        if player != leader:
+            leader = player
+            print(f"Leader: {player} ({score})")
+
+    leaderboard, outcomes = run_tournament(
+        args.directory,
+        OUTCOME if args.outcomes else SHAPE,
+        k=args.top,
+        jobs=args.jobs,
+        on_change=print_leader if args.live else None,
+    )
+
+    print(f"{len(outcomes)} players, top {args.top} (score, W-D-L):")
+    for rank, (score, player) in enumerate(leaderboard.standings(), 1):
+        print(f"{rank:4d}. {player} {score} {format_record(outcomes[player])}")
+    if args.all:
+        for player in sorted(outcomes):
+            print(f"{player} {format_record(outcomes[player])}")
+
+
+if __name__ == '__main__':
+    main()
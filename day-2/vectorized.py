@@ -0,0 +1,234 @@
+#!/usr/bin/python3
+"""
+<https://adventofcode.com/2022/day/2> "Advent of Code - Day 2"
+
+# Advent of Code 2022 --- Day 2
+
+## Vectorized scoring
+
+`get_total_score` scores one round at a time through a chain of string
+comparisons. This engine decodes the guide into two arrays of small integer
+codes, the opponent's column (`A`, `B`, `C` as 0, 1, 2) and the second column
+(`X`, `Y`, `Z` as 0, 1, 2), and scores every round at once by looking up
+`table[opponent, column]` in a 3x3 score table and summing the result.
+
+There is one table per interpretation of the second column: `SHAPE` (part
+one, `ch_1.py`) and `OUTCOME` (part two, `ch_2.py`). The tables are filled in
+from the existing `translate` and `get_round_score` of each part, so totals
+match them by construction.
+
+A well-formed guide is a run of fixed-width `A X` records, which are decoded
+by slicing the raw bytes with a stride of 4. Anything else (CRLF line endings,
+stray lines) is decoded line by line through `read_input_file` instead.
+
+NumPy is used when it is installed. Without it the codes are `bytes` decoded
+with `bytes.translate` and the lookup and sum run through `map`, which is
+slower but gives the same totals.
+"""
+
+import argparse
+import sys
+import time
+from operator import add
+from pathlib import Path
+
+import ch_1
+import ch_2
+
+try:
+    import numpy
+except ImportError:  # Fall back to the standard library
+    numpy = None
+
+SHAPE = "shape"
+OUTCOME = "outcome"
+
+OPPONENT_COLUMN = b"ABC"
+SECOND_COLUMN = b"XYZ"
+RECORD = 4  # "A X\n"
+ROW_OFFSETS = bytes.maketrans(b"\0\1\2", b"\0\3\6")
+
+
+def build_table(part):
+    """Returns the score of every (opponent, second column) pair
+
+    Args:
+        part (module): `ch_1` or `ch_2`, whose `translate` and
+          `get_round_score` define the interpretation
+
+    Returns:
+        list[list[int]]: table[opponent][column] score, codes 0 to 2
+    """
+    return [
+        [
+            part.get_round_score(
+                part.translate(opponent), part.translate(column)
+            )
+            for column in "XYZ"
+        ]
+        for opponent in "ABC"
+    ]
+
+
+TABLES = {
+    SHAPE: build_table(ch_1),
+    OUTCOME: build_table(ch_2),
+}
+
+
+def decode_rounds(rounds):
+    """Encodes rounds from `read_input_file` as code arrays
+
+    Args:
+        rounds (list[list[str]]): Rounds such as [['A', 'Y'], ...]
+
+    Returns:
+        tuple: (opponent, column) code arrays
+    """
+    opponent = bytes(OPPONENT_COLUMN.index(o.encode()) for o, _ in rounds)
+    column = bytes(SECOND_COLUMN.index(c.encode()) for _, c in rounds)
+    if numpy is not None:
+        return (
+            numpy.frombuffer(opponent, dtype=numpy.uint8),
+            numpy.frombuffer(column, dtype=numpy.uint8),
+        )
+    return opponent, column
+
+
+def decode_bytes(data):
+    """Decodes a guide of fixed-width records into code arrays
+
+    Trailing line endings are ignored and the final newline is optional.
+
+    Args:
+        data (bytes): Guide contents
+
+    Returns:
+        Union[tuple, None]: (opponent, column) code arrays, or None if the
+          guide is not a run of well-formed `A X` records
+    """
+    end = len(data)
+    while end and data[end - 1] in b"\r\n":
+        end -= 1
+    if end == 0:
+        return None
+    if end < len(data):
+        end += 1  # Keep the final newline
+    if end % RECORD == RECORD - 1:
+        data, end = data[:end] + b"\n", end + 1
+    if end % RECORD:
+        return None
+
+    if numpy is not None:
+        records = numpy.frombuffer(data, dtype=numpy.uint8, count=end)
+        records = records.reshape(-1, RECORD)
+        opponent = records[:, 0] - OPPONENT_COLUMN[0]
+        column = records[:, 2] - SECOND_COLUMN[0]
+        # Codes wrap around below zero, so one comparison checks the range
+        if (
+            (opponent > 2).any() or (column > 2).any()
+            or (records[:, 1] != ord(" ")).any()
+            or (records[:, 3] != ord("\n")).any()
+        ):
+            return None
+        return opponent, column
+
+    view = memoryview(data)[:end]
+    opponent, space, column, newline = (
+        bytes(view[offset::RECORD]) for offset in range(RECORD)
+    )
+    if (
+        opponent.translate(None, OPPONENT_COLUMN)
+        or column.translate(None, SECOND_COLUMN)
+        or space.translate(None, b" ")
+        or newline.translate(None, b"\n")
+    ):
+        return None
+    return (
+        opponent.translate(bytes.maketrans(OPPONENT_COLUMN, b"\0\1\2")),
+        column.translate(bytes.maketrans(SECOND_COLUMN, b"\0\1\2")),
+    )
+
+
+def load_codes(file_path):
+    """Reads a guide into code arrays
+
+    Args:
+        file_path (str): Path to input file
+
+    Returns:
+        tuple: (opponent, column) code arrays
+    """
+    codes = decode_bytes(Path(file_path).read_bytes())
+    if codes is None:  # Not fixed-width, take the line-by-line path
+        codes = decode_rounds(ch_1.read_input_file(file_path))
+    return codes
+
+
+def get_total_score(opponent, column, interpretation=SHAPE):
+    """Returns the total score of every round
+
+    Args:
+        opponent (array): Opponent codes, 0 to 2
+        column (array): Second column codes, 0 to 2
+        interpretation (str): SHAPE (part one) or OUTCOME (part two)
+
+    Returns:
+        int: Total score
+    """
+    table = TABLES[interpretation]
+    if numpy is not None:
+        lookup = numpy.array(table, dtype=numpy.uint8)
+        return int(lookup[opponent, column].sum(dtype=numpy.int64))
+    flat = [score for row in table for score in row]
+    rows = opponent.translate(ROW_OFFSETS)  # Code * 3
+    return sum(map(flat.__getitem__, map(add, rows, column)))
+
+
+def main():
+    """Parses command line args and prints both total scores"""
+    parser = argparse.ArgumentParser(
+        description="Vectorized Rock Paper Scissor Score Counter",
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to "encrypted" input file',
+        default="./input.txt",
+    )
+    parser.add_argument(
+        "--benchmark",
+        help="also score with ch_1.py and ch_2.py and compare times",
+        action="store_true",
+    )
+    args = parser.parse_args()
+
+    if not Path(args.file).exists():
+        parser.print_usage()
+        sys.exit()
+
+    start = time.perf_counter()
+    opponent, column = load_codes(args.file)
+    shape_score = get_total_score(opponent, column, SHAPE)
+    outcome_score = get_total_score(opponent, column, OUTCOME)
+    seconds = time.perf_counter() - start
+
+    print(f"Total score (shapes): {shape_score}") # 11449
+    print(f"Total score (outcomes): {outcome_score}") # 13187
+
+    if args.benchmark:
+        start = time.perf_counter()
+        rounds = ch_1.read_input_file(args.file)
+        assert ch_1.get_total_score(ch_1.translate_rounds(rounds)) \
+            == shape_score
+        assert ch_2.get_total_score(ch_2.translate_rounds(rounds)) \
+            == outcome_score
+        string_seconds = time.perf_counter() - start
+        engine = "NumPy" if numpy is not None else "standard library"
+        print(f"String functions: {string_seconds:.3f}s")
+        print(f"Vectorized ({engine}): {seconds:.3f}s")
+        print(f"Speedup: {string_seconds / seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
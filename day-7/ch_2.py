@@ -39,16 +39,24 @@ import functools
 import os
 import re
 import sys
+import time
 
 
 class FileNode():
     """Class FileNode represets a file instance in a FileTree
 
     Attributes:
-        children (Union[list[FileNode], None]): List of child FileNodes or None
+        children (Union[dict[str, FileNode], None]): Child FileNodes keyed by
+          file name in listing order or None
+        direct (Union[int, None]): Size of files folded into a directory
+          without keeping their nodes (see FileTree.fold) or None for a file
+        digest (Union[bytes, None]): Content hash of a directory (see
+          merkle.py), None until computed or once its subtree changes
         file (str): File name
         parent (Union[FileNode, None]): Parent node
         size (int): File size
+        total (Union[int, None]): Running total size of a directory, kept
+          current as files are added, or None for a file
     """
 
     def __init__(self, file, size=None, directory=None, parent=None):
@@ -60,22 +68,33 @@ class FileNode():
             directory (bool): True if creating directory
             parent (FileNode): Parent node or None if root
         """
-        self.children = directory and []
+        self.children = {} if directory else None
+        self.direct = 0 if directory else None
+        self.digest = None
         self.file = file
         self.parent = parent
         self.size = size
+        self.total = 0 if directory else None
 
-    def add(self, obj):
+    def add(self, obj, on_resize=None):
         """Adds a new FileNode to instance children
 
+        Listing the same directory twice keeps the existing node, so repeated
+        `ls` output does not duplicate entries or inflate sizes.
+
         Args:
             obj (FileNode): New file to add
+            on_resize (func): Passed to `grow` for every changed directory
         Returns:
             self
         """
         if self.is_dir() and isinstance(obj, FileNode):
+            if obj.file in self.children:  # Already listed
+                return self
             obj.parent = self
-            self.children.append(obj)
+            self.children[obj.file] = obj
+            self.invalidate()
+            self.grow(obj.get_size(), on_resize)
             return self
         print(f'{self.file} is not a directory')
         return None
@@ -89,27 +108,59 @@ class FileNode():
             FileNode: matching child
         """
         if self.is_dir():
-            for child in self.children:
-                if child.file == file:
-                    return child
+            return self.children.get(file)
         return None
 
     def is_dir(self):
         """Returns True if FileNode is a directory"""
         return self.children is not None
 
+    def invalidate(self):
+        """Clears the digest of this directory and its ancestors
+
+        Stops at the first directory without a digest, since digests are
+        only ever computed for a directory after all directories below it.
+
+        Returns:
+            self
+        """
+        cursor = self
+        while cursor is not None and cursor.digest is not None:
+            cursor.digest = None
+            cursor = cursor.parent
+        return self
+
+    def grow(self, delta, on_resize=None):
+        """Adds delta to the total of this directory and every ancestor
+
+        Args:
+            delta (int): Change in size
+            on_resize (func): Called as on_resize(directory, previous_total)
+              after each total changes
+
+        Returns:
+            self
+        """
+        if not delta:
+            return self
+        cursor = self
+        while cursor is not None:
+            previous = cursor.total
+            cursor.total = previous + delta
+            if on_resize:
+                on_resize(cursor, previous)
+            cursor = cursor.parent
+        return self
+
     def get_size(self):
-        """Recursively sums file sizes in the case of a directory else returns
+        """Returns the running total in the case of a directory else returns
         size attribute
 
         Returns:
             int: Size of file or total size of child files
         """
         if self.is_dir():
-            size = 0
-            for child in self.children:
-                size = size + child.get_size()
-            return size
+            return self.total
         return self.size
 
 
@@ -119,23 +170,66 @@ class FileTree():
     Attributes:
         root (FileNode): root node, always a directory, no parent
         cwd (FileNode): current working directory, cursor
+        on_resize (Union[func, None]): Called as on_resize(directory,
+          previous_total) whenever a directory total changes
     """
 
     def __init__(self):
         """Constructor"""
         self.root = FileNode('', directory=True)
         self.cwd = self.root
+        self.on_resize = None
+        self._folding = None  # Directory whose files are being folded
+        self._listed = set()  # Directories whose files were already folded
 
     def add(self, obj):
         """Adds a file node at current working directory (cwd)
 
+        The new file's size is pushed up the parent chain, so every directory
+        total is current after each call.
+
         Args:
             obj (FileNode): New file
 
         Returns:
             self
         """
-        self.cwd.add(obj)
+        self.cwd.add(obj, self.on_resize)
+        return self
+
+    def fold(self, size):
+        """Adds a file's size to current working directory (cwd) without
+        keeping a node for the file
+
+        Only directory nodes stay in memory. Since file names are dropped, a
+        directory whose files were already folded ignores later listings of
+        its files instead of counting them twice. A listing ends at the next
+        `cd` or `ls` (see end_listing).
+
+        Args:
+            size (int): File size
+
+        Returns:
+            self
+        """
+        if self.cwd in self._listed:  # Listed again
+            return self
+        self._folding = self.cwd
+        self.cwd.direct = self.cwd.direct + size
+        self.cwd.invalidate()
+        self.cwd.grow(size, self.on_resize)
+        return self
+
+    def end_listing(self):
+        """Marks the listing being folded as complete, so that listing the
+        same directory again does not fold its files twice
+
+        Returns:
+            self
+        """
+        if self._folding is not None:
+            self._listed.add(self._folding)
+            self._folding = None
         return self
 
     def cd(self, path):
@@ -147,6 +241,8 @@ class FileTree():
         Returns
             self
         """
+        self.end_listing()
+
         if path == '..':  # up a directory
             self.cwd = self.cwd.parent or self.root
             return self
@@ -163,6 +259,35 @@ class FileTree():
             print(f'{path} is not a valid directory')
         return self
 
+    def walk(self, node=None, prune=None):
+        """Lazily yields FileNodes below node, depth first in listing order
+
+        Uses an explicit stack of child iterators rather than recursion, so
+        the depth of the tree is not limited by the interpreter.
+
+        Args:
+            node (FileNode): Directory to start below, defaults to root
+            prune (func): Called on each directory after it is yielded; if it
+              returns True the directory's descendants are skipped
+
+        Yields:
+            FileNode: Every node below node that has not been pruned
+        """
+        if node is None:
+            node = self.root
+
+        stack = [iter(node.children.values())]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:  # Directory exhausted
+                stack.pop()
+                continue
+
+            yield child
+
+            if child.is_dir() and not (prune and prune(child)):
+                stack.append(iter(child.children.values()))
+
     def crawl(self, callback, node=None):
         """Crawls FileNodes and executes callback
 
@@ -172,14 +297,17 @@ class FileTree():
         Returns:
             self
         """
-        if node is None:
-            node = self.root
-
-        for child in node.children:
+        for child in self.walk(node):
             callback(child)
+        return self
 
-            if child.is_dir():
-                self.crawl(callback, node=child)
+    def compute_sizes(self):
+        """Directory totals are kept current by `add`, so there is nothing to
+        compute; kept for parity with CompactFileTree
+
+        Returns:
+            self
+        """
         return self
 
     def ls(self):
@@ -190,12 +318,15 @@ class FileTree():
         Returns:
             self
         """
-        for node in self.cwd.children:
+        for node in self.cwd.children.values():
             if node.is_dir():
                 print(f'dir {node.file}')
             else:
                 print(f'{node.size} {node.file}')
 
+        if self.cwd.direct:
+            print(f'{self.cwd.direct} (folded files)')
+
         return self
 
     def pwd(self):
@@ -224,34 +355,26 @@ class FileTree():
         Returns:
             list[FileNode]: A list of matching FileNodes
         """
-        dirs = []
+        # A directory is never larger than its parent, so nothing below a
+        # directory under the limit can match
+        return [
+            node for node in self.walk(prune=lambda x: x.get_size() < limit)
+            if node.is_dir() and node.get_size() >= limit
+        ]
 
-        self.crawl(
-            lambda x: x.is_dir() and x.get_size() >= limit and dirs.append(x)
-        )
-        return dirs
 
+def build(lines, file_tree, lean=False):
+    """Executes transcript lines against a file tree
 
-def main():
-    """Parses args, builds FileTree, executes input, and prints result"""
-    parser = argparse.ArgumentParser()
-    parser.add_argument(
-        "-f",
-        "--file",
-        help='path to input file',
-        default="input.txt",
-    )
-    args = parser.parse_args()
-
-    if not os.path.exists(args.file):
-        parser.print_usage()
-        sys.exit()
-
-    with open(args.file, encoding='utf8') as file:
-        lines = file.readlines()
-
-    file_tree = FileTree()
+    Args:
+        lines (Iterable[str]): Transcript lines
+        file_tree (FileTree): Tree to fill (any object with `cd` and `add`)
+        lean (bool): Fold file sizes into their directory instead of adding
+          file nodes, and intern directory names
 
+    Returns:
+        FileTree: The filled tree
+    """
     for line in lines:
         tokens = line.split()
 
@@ -261,13 +384,32 @@ def main():
         if tokens[0] == '$' and tokens[1] == 'cd':  # Change directory
             file_tree.cd(tokens[2])
 
+        if tokens[0] == '$' and tokens[1] == 'ls' and lean:  # New listing
+            file_tree.end_listing()
+
         if tokens[0] == 'dir':  # Create the directory listed in input
-            file_tree.add(FileNode(tokens[1], directory=True))
+            name = sys.intern(tokens[1]) if lean else tokens[1]
+            file_tree.add(FileNode(name, directory=True))
 
         if re.match(r'^\d+$', tokens[0]):  # Create file listed in input
             size = int(tokens[0])
-            file_tree.add(FileNode(tokens[1], size=size))
+            if lean:
+                file_tree.fold(size)
+            else:
+                file_tree.add(FileNode(tokens[1], size=size))
+
+    return file_tree
+
+
+def get_space_needed(file_tree):
+    """Returns the space a deletion must free for the update to run
 
+    Args:
+        file_tree (FileTree): Parsed tree
+
+    Returns:
+        int: Space needed, 0 if there is already enough
+    """
     MAX_FILE_SPACE = 70000000
     used_space = file_tree.root.get_size()
     space_available = MAX_FILE_SPACE - used_space
@@ -275,16 +417,137 @@ def main():
     space_needed = abs(space_available - UPDATE_SIZE) \
         if UPDATE_SIZE > space_available \
         else 0
+    return space_needed
+
+
+def get_smallest_candidate(file_tree):
+    """Returns the smallest directory that frees enough space for the update
 
-    dirs = file_tree.get_dirs_larger_than(space_needed)  # Grab candidates
+    Only directories at least as large as the space needed are visited.
 
-    smallest_candidate = functools.reduce(
+    Args:
+        file_tree (FileTree): Parsed tree
+
+    Returns:
+        Union[FileNode, None]: Smallest sufficient directory, None if no
+          directory below the root is large enough
+    """
+    dirs = file_tree.get_dirs_larger_than(get_space_needed(file_tree))
+
+    if not dirs:
+        return None
+
+    return functools.reduce(
         lambda a, b: a if a.get_size() < b.get_size() else b, dirs
     )
-    print('Smallest directory that allows for update:')
-    # dir wvq - 4183246
-    print(f'dir {smallest_candidate.file} - {smallest_candidate.get_size()}')
 
 
+def format_candidate(candidate):
+    """Returns a candidate directory as printed, 'none' if there is none"""
+    if candidate is None:
+        return 'none'
+    return f'dir {candidate.file} - {candidate.get_size()}'
+
+
+def follow(file, interval=1.0, pending=''):
+    """Yields batches of complete lines as they are appended to a file, like
+    `tail -f`
+
+    Args:
+        file (TextIO): Open file, already read to the end
+        interval (float): Seconds to wait when no new data is available
+        pending (str): Start of an unterminated line already read
+
+    Yields:
+        list[str]: Newly completed lines
+    """
+    while True:
+        chunk = file.read()
+        if not chunk:
+            time.sleep(interval)
+            continue
+        lines = (pending + chunk).split('\n')
+        pending = lines.pop()  # Incomplete until its newline arrives
+        if lines:
+            yield lines
+
+
+def main():
+    """Parses args, builds FileTree, executes input, and prints result"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to input file',
+        default="input.txt",
+    )
+    parser.add_argument(
+        "--follow",
+        help='keep reading lines appended to the file and re-answer',
+        action='store_true',
+    )
+    parser.add_argument(
+        "--interval",
+        help='seconds between checks for new lines when following',
+        default=1.0,
+        type=float,
+    )
+    parser.add_argument(
+        "--lean",
+        help='keep only directory nodes, folding file sizes into them',
+        action='store_true',
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        parser.print_usage()
+        sys.exit()
+
+    with open(args.file, encoding='utf8') as file:
+        lines = file.readlines()
+        pending = ''
+        if args.follow and lines and not lines[-1].endswith('\n'):
+            pending = lines.pop()  # Still being written, finish it in follow
+
+        file_tree = build(lines, FileTree(), lean=args.lean)
+
+        smallest_candidate = get_smallest_candidate(file_tree)
+        print('Smallest directory that allows for update:')
+        # dir wvq - 4183246
+        print(format_candidate(smallest_candidate))
+
+        if not args.follow:
+            return
+
+        resized = set()  # Directories whose totals changed in this batch
+
+        def track(directory, previous):
+            """Collects the directories that may have become the candidate"""
+            if directory.parent is not None:  # Root is never a candidate
+                resized.add(directory)
+
+        file_tree.on_resize = track
+
+        try:
+            for batch in follow(file, args.interval, pending):
+                build(batch, file_tree, lean=args.lean)
+                space_needed = get_space_needed(file_tree)
+                if smallest_candidate is None \
+                        or smallest_candidate.get_size() < space_needed:
+                    # Totals and the space needed only grow, so a walk is
+                    # only needed once the candidate is no longer enough
+                    smallest_candidate = get_smallest_candidate(file_tree)
+                else:
+                    # Any other directory that was large enough was already
+                    # larger than the candidate, unless it grew
+                    for directory in resized:
+                        if space_needed <= directory.get_size() \
+                                < smallest_candidate.get_size():
+                            smallest_candidate = directory
+                resized.clear()
+                print(format_candidate(smallest_candidate))
+        except KeyboardInterrupt:
+            pass
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,412 @@
+#!/usr/bin/python3
+
+"""
+<https://adventofcode.com/2022/day/7> 'Advent of Code - Day 7'
+
+# Advent of Code 2022 --- Day 7
+
+## Compact FileTree
+
+An alternative `FileTree` backend that keeps every node in parallel typed
+arrays instead of one Python object per entry. Node `i` is described by
+`parent[i]`, `size[i]`, `first_child[i]`, `next_sibling[i]`, `name[i]` (an id
+into a shared, interned name table) and `directory[i]`, which costs a fixed
+25 bytes per node plus one dictionary slot per directory for `cd` lookups.
+
+Nodes are only ever appended below an existing directory, so a parent always
+has a lower index than its children and all directory totals can be computed
+with a single reverse sweep over the arrays.
+
+`add`, `cd`, `walk`, `crawl`, `ls`, `pwd`, `get_dirs_by_size` and
+`get_dirs_larger_than` behave like their counterparts in `ch_1.py` and
+`ch_2.py`. Nodes handed to callbacks and returned from queries are lightweight
+`CompactNode` views created on demand.
+
+Running this file parses the transcript into both backends, and into a
+`FileTree` built with `lean=True` (file sizes folded into directories), and
+prints the memory each uses per transcript entry.
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+from array import array
+
+from ch_1 import FileTree, build
+
+NO_NODE = -1
+
+
+class CompactNode():
+    """Class CompactNode is a read-only view of one node in a CompactFileTree
+
+    Attributes:
+        index (int): Node index into the tree arrays
+        tree (CompactFileTree): Tree holding the node data
+    """
+
+    __slots__ = ('index', 'tree')
+
+    def __init__(self, tree, index):
+        """Constructor
+
+        Args:
+            tree (CompactFileTree): Tree holding the node data
+            index (int): Node index into the tree arrays
+        """
+        self.tree = tree
+        self.index = index
+
+    @property
+    def file(self):
+        """str: File name"""
+        return self.tree.names[self.tree.name[self.index]]
+
+    @property
+    def size(self):
+        """Union[int, None]: File size or None if a directory"""
+        if self.is_dir():
+            return None
+        return self.tree.size[self.index]
+
+    @property
+    def parent(self):
+        """Union[CompactNode, None]: Parent node or None if root"""
+        parent = self.tree.parent[self.index]
+        if parent == NO_NODE:
+            return None
+        return CompactNode(self.tree, parent)
+
+    def is_dir(self):
+        """Returns True if node is a directory"""
+        return bool(self.tree.directory[self.index])
+
+    def get_size(self):
+        """Returns size of file or total size of child files
+
+        Returns:
+            int: Size of file or total size of child files
+        """
+        if self.is_dir():
+            self.tree.compute_sizes()
+        return self.tree.size[self.index]
+
+
+class CompactFileTree():
+    """Class CompactFileTree stores a FileTree as parallel typed arrays
+
+    Attributes:
+        cwd (int): Index of current working directory, cursor
+        directory (array[int]): 1 if node is a directory else 0
+        first_child (array[int]): Index of first child or NO_NODE
+        name (array[int]): Id of node name in `names`
+        names (list[str]): Interned name table
+        next_sibling (array[int]): Index of next sibling or NO_NODE
+        parent (array[int]): Index of parent node or NO_NODE if root
+        root (int): Index of root node, always 0
+        size (array[int]): File size, or cached total size for directories
+    """
+
+    def __init__(self):
+        """Constructor"""
+        self.parent = array('i')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.name = array('i')
+        self.size = array('q')
+        self.directory = array('B')
+        self.names = []
+        self._name_ids = {}
+        self._dirs = {}  # (parent << 32 | name id) -> directory index
+        self._cwd_names = None  # name ids listed in cwd, built on demand
+        self._cwd_tail = NO_NODE
+        self._stale = False
+        self.root = self._new_node(NO_NODE, '', 0, True)
+        self.cwd = self.root
+
+    def __len__(self):
+        """Returns number of nodes, including root"""
+        return len(self.parent)
+
+    def _intern(self, file):
+        """Returns the id of a name, adding it to the name table if new"""
+        name_id = self._name_ids.get(file)
+        if name_id is None:
+            name_id = len(self.names)
+            self._name_ids[file] = name_id
+            self.names.append(file)
+        return name_id
+
+    def _new_node(self, parent, file, size, directory):
+        """Appends a node to the arrays and returns its index"""
+        index = len(self.parent)
+        self.parent.append(parent)
+        self.first_child.append(NO_NODE)
+        self.next_sibling.append(NO_NODE)
+        self.name.append(self._intern(file))
+        self.size.append(size)
+        self.directory.append(1 if directory else 0)
+        return index
+
+    def _load_cwd(self):
+        """Collects child names and the last child of cwd for add()"""
+        self._cwd_names = set()
+        self._cwd_tail = NO_NODE
+        child = self.first_child[self.cwd]
+        while child != NO_NODE:
+            self._cwd_names.add(self.name[child])
+            self._cwd_tail = child
+            child = self.next_sibling[child]
+
+    def add(self, obj):
+        """Adds a file at current working directory (cwd)
+
+        Listing the same directory twice keeps the existing node.
+
+        Args:
+            obj (FileNode): New file, only its name, size and type are kept
+
+        Returns:
+            self
+        """
+        if self._cwd_names is None:
+            self._load_cwd()
+        name_id = self._intern(obj.file)
+        if name_id in self._cwd_names:  # Already listed
+            return self
+
+        directory = obj.is_dir()
+        index = self._new_node(
+            self.cwd, obj.file, 0 if directory else obj.size, directory
+        )
+        if self._cwd_tail == NO_NODE:
+            self.first_child[self.cwd] = index
+        else:
+            self.next_sibling[self._cwd_tail] = index
+        self._cwd_tail = index
+        self._cwd_names.add(name_id)
+
+        if directory:
+            self._dirs[self.cwd << 32 | name_id] = index
+        self._stale = True
+        return self
+
+    def cd(self, path):
+        """Changes current working directory (cwd)
+
+        Args:
+            path (str): Target directory
+
+        Returns
+            self
+        """
+        if path == '..':  # up a directory
+            parent = self.parent[self.cwd]
+            self._set_cwd(self.root if parent == NO_NODE else parent)
+            return self
+
+        if path == '/':  # cd to root
+            self._set_cwd(self.root)
+            return self
+
+        name_id = self._name_ids.get(path)
+        new_node = None if name_id is None \
+            else self._dirs.get(self.cwd << 32 | name_id)
+        # check for validity
+        if new_node is not None:
+            self._set_cwd(new_node)
+        else:
+            print(f'{path} is not a valid directory')
+        return self
+
+    def _set_cwd(self, index):
+        """Moves cursor, dropping the cached listing of the old cwd"""
+        if index != self.cwd:
+            self.cwd = index
+            self._cwd_names = None
+
+    def compute_sizes(self):
+        """Caches the total size of every directory in one reverse sweep
+
+        Children always have higher indexes than their parents, so walking
+        the arrays backwards finishes every directory before its parent.
+
+        Returns:
+            self
+        """
+        if not self._stale:
+            return self
+        size, parent, directory = self.size, self.parent, self.directory
+        for index, is_dir in enumerate(directory):
+            if is_dir:
+                size[index] = 0
+        for index in range(len(parent) - 1, 0, -1):
+            size[parent[index]] += size[index]
+        self._stale = False
+        return self
+
+    def walk(self, node=None, prune=None):
+        """Lazily yields nodes below node, depth first in listing order
+
+        Args:
+            node (CompactNode): Directory to start below, defaults to root
+            prune (func): Called on each directory after it is yielded; if it
+              returns True the directory's descendants are skipped
+
+        Yields:
+            CompactNode: Every node below node that has not been pruned
+        """
+        first_child, next_sibling = self.first_child, self.next_sibling
+        start = self.root if node is None else node.index
+        stack = [first_child[start]]
+        while stack:
+            index = stack[-1]
+            if index == NO_NODE:  # Directory exhausted
+                stack.pop()
+                continue
+            stack[-1] = next_sibling[index]
+            child = CompactNode(self, index)
+
+            yield child
+
+            if self.directory[index] and not (prune and prune(child)):
+                stack.append(first_child[index])
+
+    def crawl(self, callback, node=None):
+        """Crawls nodes depth first in listing order and executes callback
+
+        Args:
+            callback (func): Executes on every node (as a CompactNode)
+            node (CompactNode): Node to start below, defaults to root
+
+        Returns:
+            self
+        """
+        for child in self.walk(node):
+            callback(child)
+        return self
+
+    def ls(self):
+        """Prints files in current working directory (cwd)
+
+        Returns:
+            self
+        """
+        child = self.first_child[self.cwd]
+        while child != NO_NODE:
+            node = CompactNode(self, child)
+            if node.is_dir():
+                print(f'dir {node.file}')
+            else:
+                print(f'{node.size} {node.file}')
+            child = self.next_sibling[child]
+        return self
+
+    def pwd(self):
+        """Prints complete file path from root to current working directory
+
+        Returns:
+            self
+        """
+        parts = []
+        cursor = self.cwd
+        while cursor != self.root:
+            parts.append(self.names[self.name[cursor]])
+            cursor = self.parent[cursor]
+        print('/' + '/'.join(reversed(parts)))
+        return self
+
+    def _get_dirs(self, matches):
+        """Returns a CompactNode for every directory whose total matches"""
+        self.compute_sizes()
+        size, directory = self.size, self.directory
+        return [
+            CompactNode(self, index)
+            for index in range(1, len(directory))
+            if directory[index] and matches(size[index])
+        ]
+
+    def get_dirs_by_size(self, limit):
+        """Returns a list of directory files that have a total size up to the
+        limit
+
+        Args:
+            limit (int): Filter for directories returns
+
+        Returns:
+            list[CompactNode]: A list of matching nodes
+        """
+        return self._get_dirs(lambda size: size <= limit)
+
+    def get_dirs_larger_than(self, limit):
+        """Returns a list of directory files that have a total size greater
+        than or equal to limit
+
+        Args:
+            limit (int): Filter for directories returns
+
+        Returns:
+            list[CompactNode]: A list of matching nodes
+        """
+        return self._get_dirs(lambda size: size >= limit)
+
+
+def measure(lines, tree_class, lean=False):
+    """Builds a tree under tracemalloc and returns it with bytes allocated
+
+    Args:
+        lines (list[str]): Transcript lines
+        tree_class (type): FileTree or CompactFileTree
+        lean (bool): Fold file sizes into directories (FileTree only)
+
+    Returns:
+        tuple[Union[FileTree, CompactFileTree], int]: Tree and bytes in use
+    """
+    tracemalloc.start()
+    file_tree = build(lines, tree_class(), lean=lean)
+    file_tree.compute_sizes()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return file_tree, current
+
+
+def main():
+    """Parses args, builds both backends and prints memory used per node"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to input file',
+        default="input.txt",
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        parser.print_usage()
+        sys.exit()
+
+    with open(args.file, encoding='utf8') as file:
+        lines = file.readlines()
+
+    compact_tree, compact_bytes = measure(lines, CompactFileTree)
+    object_tree, object_bytes = measure(lines, FileTree)
+    lean_tree, lean_bytes = measure(lines, FileTree, lean=True)
+    nodes = len(compact_tree) - 1  # root is not listed in the transcript
+
+    compact_total, object_total, lean_total = (
+        sum(d.get_size() for d in tree.get_dirs_by_size(100000))
+        for tree in (compact_tree, object_tree, lean_tree)
+    )
+    assert object_total == compact_total == lean_total
+
+    print(f'Nodes: {nodes}')
+    if nodes:  # Nothing to compare per node in an empty transcript
+        print(f'FileTree: {object_bytes / nodes:.1f} bytes per node')
+        print(f'FileTree (lean): {lean_bytes / nodes:.1f} bytes per node')
+        print(f'CompactFileTree: {compact_bytes / nodes:.1f} bytes per node')
+    print(f'The sum of the size of directories that match is {compact_total}')
+
+
+if __name__ == '__main__':
+    main()
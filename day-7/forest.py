@@ -0,0 +1,145 @@
+#!/usr/bin/python3
+
+"""
+<https://adventofcode.com/2022/day/7> 'Advent of Code - Day 7'
+
+# Advent of Code 2022 --- Day 7
+
+## Multi-transcript forest
+
+Ingests one transcript per host. Each transcript is parsed into its own lean
+`FileTree` in a process pool, which answers both parts for that host and hands
+back only the direct size of each of its directories. Results are reported in
+the order they finish, so one slow or huge transcript does not hold up the
+others, and a transcript that fails to parse is reported without stopping the
+run.
+
+The per-host directories are merged by path into one forest whose directory
+totals combine every host, and both parts are answered for it as well.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ch_1 import FileNode, FileTree
+from size_index import MAX_FILE_SPACE, UPDATE_SIZE, SizeIndex
+from tokenizer import build_from_file
+
+
+def iter_directories(file_tree):
+    """Yields every directory with its path, parents before children
+
+    Args:
+        file_tree (FileTree): Parsed tree
+
+    Yields:
+        tuple[tuple[str], FileNode]: Path names (() for root) and directory
+    """
+    stack = [((), file_tree.root)]
+    while stack:
+        names, node = stack.pop()
+        yield names, node
+        for child in reversed(node.children.values()):
+            if child.is_dir():
+                stack.append((names + (child.file,), child))
+
+
+def summarize(path):
+    """Parses one transcript and answers both parts for it
+
+    Args:
+        path (str): Path to transcript
+
+    Returns:
+        dict: 'part_1' and 'part_2' answers, and 'direct' mapping each
+          directory's path names to the size of the files directly in it
+    """
+    file_tree = build_from_file(path, FileTree(), lean=True)
+    size_index = SizeIndex.from_tree(file_tree)
+    return {
+        'part_1': size_index.sum_at_most(100000),
+        'part_2': size_index.smallest_to_delete(
+            [(MAX_FILE_SPACE, UPDATE_SIZE)]
+        )[0],
+        'direct': {
+            names: node.direct for names, node in iter_directories(file_tree)
+        },
+    }
+
+
+def merge_into(file_tree, direct):
+    """Adds a host's directories and direct sizes to a forest by path
+
+    Args:
+        file_tree (FileTree): Merged forest
+        direct (dict[tuple[str], int]): From `summarize`
+
+    Returns:
+        FileTree: The forest
+    """
+    for names, size in direct.items():
+        node = file_tree.root
+        for name in names:
+            child = node.get_file(name)
+            if child is None:
+                child = FileNode(name, directory=True)
+                node.add(child)
+            node = child
+        node.direct = node.direct + size
+        node.grow(size)
+    return file_tree
+
+
+def main():
+    """Parses args, ingests every transcript and prints per-host and merged
+    results"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "files",
+        help='transcripts, one per host',
+        nargs='*',
+        default=["input.txt"],
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help='worker processes (default: CPU count)',
+        type=int,
+    )
+    args = parser.parse_args()
+
+    missing = [path for path in args.files if not os.path.exists(path)]
+    if missing:
+        parser.print_usage()
+        sys.exit()
+
+    forest = FileTree()
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {
+            executor.submit(summarize, path): path for path in args.files
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = future.result()
+            except Exception as error:  # Report it and keep going
+                print(f'{path}: failed ({error})')
+                continue
+            print(f'{path}: {result["part_1"]} {result["part_2"]}')
+            merge_into(forest, result['direct'])
+
+    size_index = SizeIndex.from_tree(forest)
+    print(
+        'Merged: sum of directories that match is '
+        f'{size_index.sum_at_most(100000)}'
+    )
+    print(
+        'Merged: smallest directory that allows for update is '
+        f'{size_index.smallest_to_delete([(MAX_FILE_SPACE, UPDATE_SIZE)])[0]}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+
+"""
+<https://adventofcode.com/2022/day/7> 'Advent of Code - Day 7'
+
+# Advent of Code 2022 --- Day 7
+
+## Merkle-hashed subtree diffing
+
+Compares two transcripts of the same machine taken on different days. Every
+directory gets a content digest hashed from its sorted entries: a file
+contributes its name and size, a subdirectory its name and digest, and the
+sizes folded into a lean directory (`FileNode.direct`) are hashed as well.
+Equal digests mean equal subtrees, so `diff` only descends into directories
+whose digests differ and its cost follows the size of the change rather than
+the size of the trees.
+
+Digests are stored on `FileNode.digest` and computed once in a post-order
+pass. `FileNode.add` and `FileTree.fold` clear the digests up the parent
+chain, so recomputing after more input only rehashes the changed paths.
+
+Both transcripts must be parsed the same way (both lean or both full), since a
+lean directory hashes its folded sizes instead of its files.
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+
+from ch_1 import FileTree
+from tokenizer import build_from_file
+
+DIGEST_SIZE = 16
+
+
+def hash_directory(node):
+    """Returns the digest of a directory whose subdirectories are hashed
+
+    Args:
+        node (FileNode): Directory
+
+    Returns:
+        bytes: Content digest
+    """
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    digest.update(b'%d\0' % node.direct)
+    for name in sorted(node.children):
+        child = node.children[name]
+        digest.update(name.encode())
+        if child.is_dir():
+            digest.update(b'\0d' + child.digest)
+        else:
+            digest.update(b'\0f%d\0' % child.size)
+    return digest.digest()
+
+
+def compute_digests(file_tree):
+    """Fills in every missing directory digest, children before parents
+
+    Args:
+        file_tree (FileTree): Parsed tree
+
+    Returns:
+        bytes: Digest of the root
+    """
+    stack = [(file_tree.root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            node.digest = hash_directory(node)
+            continue
+        stack.append((node, True))
+        for child in node.children.values():
+            if child.is_dir() and child.digest is None:
+                stack.append((child, False))
+    return file_tree.root.digest
+
+
+def diff(old_tree, new_tree):
+    """Lists the directories whose contents differ between two trees
+
+    Identical subtrees are skipped without being visited. A directory that
+    exists on only one side is reported once, without its subdirectories.
+
+    Args:
+        old_tree (FileTree): Earlier tree
+        new_tree (FileTree): Later tree
+
+    Returns:
+        list[tuple[str, int, int]]: (path, old total, new total) in path
+          order, with 0 for the side a directory is missing from
+    """
+    compute_digests(old_tree)
+    compute_digests(new_tree)
+    changes = []
+    stack = [('', old_tree.root, new_tree.root)]
+    while stack:
+        path, old, new = stack.pop()
+        if old is None or new is None:  # Added or removed
+            changes.append((
+                path,
+                old.get_size() if old else 0,
+                new.get_size() if new else 0,
+            ))
+            continue
+        if old.digest == new.digest:
+            continue
+        changes.append((path or '/', old.get_size(), new.get_size()))
+        names = {
+            name for node in (old, new)
+            for name, child in node.children.items() if child.is_dir()
+        }
+        for name in sorted(names, reverse=True):
+            old_child = old.get_file(name)
+            new_child = new.get_file(name)
+            stack.append((
+                f'{path}/{name}',
+                old_child if old_child and old_child.is_dir() else None,
+                new_child if new_child and new_child.is_dir() else None,
+            ))
+    return changes
+
+
+def main():
+    """Parses args, builds both trees and prints the changed directories"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "old",
+        help='earlier transcript',
+    )
+    parser.add_argument(
+        "new",
+        help='later transcript',
+    )
+    parser.add_argument(
+        "--lean",
+        help='keep only directory nodes, folding file sizes into them',
+        action='store_true',
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.old) or not os.path.exists(args.new):
+        parser.print_usage()
+        sys.exit()
+
+    old_tree = build_from_file(args.old, FileTree(), lean=args.lean)
+    new_tree = build_from_file(args.new, FileTree(), lean=args.lean)
+    changes = diff(old_tree, new_tree)
+    for path, old_size, new_size in changes:
+        print(f'{new_size - old_size:+12d} {path} ({old_size} -> {new_size})')
+    if not changes:
+        print('No changes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/python3
+
+"""
+<https://adventofcode.com/2022/day/7> 'Advent of Code - Day 7'
+
+# Advent of Code 2022 --- Day 7
+
+## Parallel chunked parsing
+
+Splits one transcript into line-aligned byte ranges and parses them in a
+process pool. A worker does not know which directory its range starts in, so
+it tracks its current directory relative to that unknown start: a count of
+`cd ..` steps above it plus the names entered below it, until a `$ cd /` makes
+the path absolute. Each worker returns, in order, its folding sessions (runs of
+file sizes listed without an intervening `cd` or `ls`) and its `dir` entries,
+keyed by those relative paths.
+
+The merge walks the partial results in file order. The directory a range ends
+in resolves the relative paths of the next range, and the folding rules of
+`FileTree.fold` are applied to the sessions. The result is a lean `FileTree`
+(directories only) whose totals match a serial `build(..., lean=True)`
+exactly.
+
+As in the puzzle input, every `cd x` is assumed to name a listed directory.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ch_1 import FileNode, FileTree
+from size_index import MAX_FILE_SPACE, UPDATE_SIZE, SizeIndex
+from tokenizer import (
+    CD, DIR, FILE, LS, build_from_file, iter_lines, iter_records, map_file
+)
+
+
+def split_offsets(buffer, chunks):
+    """Returns line-aligned (start, stop) byte ranges covering a buffer
+
+    Args:
+        buffer (Union[bytes, mmap.mmap]): Transcript contents
+        chunks (int): Number of ranges wanted
+
+    Returns:
+        list[tuple[int, int]]: Non-empty ranges in file order
+    """
+    size = len(buffer)
+    offsets = [0]
+    for chunk in range(1, chunks):
+        offset = buffer.find(b'\n', max(size * chunk // chunks, offsets[-1]))
+        if offset == -1:
+            break
+        offsets.append(offset + 1)
+    offsets.append(size)
+    return [
+        (start, stop) for start, stop in zip(offsets, offsets[1:])
+        if start < stop
+    ]
+
+
+def parse_range(path, start, stop):
+    """Parses one byte range of a transcript with relative directory paths
+
+    Paths are (absolute, ups, names) tuples: `ups` is how many levels above
+    the range's starting directory they climb before descending into `names`.
+    Once a `$ cd /` is seen they are absolute and `ups` is 0.
+
+    Args:
+        path (str): Path to transcript
+        start (int): Offset of first line
+        stop (int): Offset to stop before
+
+    Returns:
+        dict: 'sessions' (list of [path, size]), 'dirs' (list of (path,
+          name)), 'end' (path of final directory), 'continues' (no `cd` or
+          `ls` before the first session) and 'closes' (a `cd` or `ls` after
+          the last session, or anywhere if there are no sessions)
+    """
+    buffer = map_file(path)
+    absolute, ups, names = False, 0, []
+    sessions = []
+    dirs = []
+    folding = False  # No cd or ls since the last file
+    seen_end = False  # A cd or ls, which ends any open session
+
+    for kind, name, size in iter_records(
+        iter_lines(buffer, start, stop), file_names=False
+    ):
+        if kind is FILE:
+            if not folding:
+                sessions.append([(absolute, ups, tuple(names)), 0])
+                folding = True
+            sessions[-1][1] += size
+        elif kind is DIR:
+            dirs.append(((absolute, ups, tuple(names)), name))
+        elif kind is LS:
+            if not sessions:
+                seen_end = True
+            folding = False
+        elif kind is CD:
+            if not sessions:
+                seen_end = True
+            folding = False
+            if name == '/':
+                absolute, ups, names = True, 0, []
+            elif name == '..':
+                if names:
+                    names.pop()
+                elif not absolute:
+                    ups += 1
+            else:
+                names.append(name)
+
+    if not isinstance(buffer, bytes):
+        buffer.close()
+    return {
+        'sessions': sessions,
+        'dirs': dirs,
+        'end': (absolute, ups, tuple(names)),
+        'continues': bool(sessions) and not seen_end,
+        'closes': not folding if sessions else seen_end,
+    }
+
+
+def resolve(base, relative):
+    """Returns the absolute names of a relative path
+
+    Args:
+        base (tuple[str]): Absolute names of the range's starting directory
+        relative (tuple[bool, int, tuple[str]]): Path from `parse_range`
+
+    Returns:
+        tuple[str]: Absolute names, () for root
+    """
+    absolute, ups, names = relative
+    if absolute:
+        return names
+    return base[:max(len(base) - ups, 0)] + names
+
+
+def merge(partials):
+    """Merges per-range results into one lean FileTree
+
+    Args:
+        partials (Iterable[dict]): `parse_range` results in file order
+
+    Returns:
+        FileTree: Directories only, with file sizes folded into them
+    """
+    file_tree = FileTree()
+    nodes = {(): file_tree.root}
+
+    def node_at(names):
+        node = nodes.get(names)
+        if node is None:
+            parent = node_at(names[:-1])
+            node = parent.get_file(names[-1])
+            if node is None:
+                node = FileNode(names[-1], directory=True)
+                parent.add(node)
+            nodes[names] = node
+        return node
+
+    base = ()
+    listed = set()  # Directories whose folding session has ended
+    current = None  # Directory of the open folding session
+    skipping = False  # The open session lists a directory again
+
+    for partial in partials:
+        for relative, name in partial['dirs']:
+            node_at(resolve(base, relative)).add(
+                FileNode(name, directory=True)
+            )
+
+        for index, (relative, size) in enumerate(partial['sessions']):
+            names = resolve(base, relative)
+            if index or not partial['continues'] or current is None:
+                if current is not None and not skipping:
+                    listed.add(current)  # A cd or ls ended it
+                current, skipping = names, names in listed
+            if not skipping:
+                node = node_at(names)
+                node.direct = node.direct + size
+                node.grow(size)
+
+        if partial['closes'] and current is not None:
+            if not skipping:
+                listed.add(current)
+            current = None
+        base = resolve(base, partial['end'])
+
+    return file_tree
+
+
+def parse_parallel(path, jobs=None):
+    """Parses a transcript in a process pool and merges the results
+
+    Args:
+        path (str): Path to transcript
+        jobs (int): Worker processes, defaults to the CPU count
+
+    Returns:
+        FileTree: Lean tree equivalent to a serial `build(..., lean=True)`
+    """
+    jobs = jobs or os.cpu_count() or 1
+    buffer = map_file(path)
+    ranges = split_offsets(buffer, jobs * 4)
+    if not isinstance(buffer, bytes):
+        buffer.close()
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        partials = executor.map(
+            parse_range,
+            [path] * len(ranges),
+            [start for start, _ in ranges],
+            [stop for _, stop in ranges],
+        )
+        return merge(partials)
+
+
+def main():
+    """Parses args, parses the transcript in parallel and prints results"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to input file',
+        default="input.txt",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help='worker processes (default: CPU count)',
+        type=int,
+    )
+    parser.add_argument(
+        "--check",
+        help='also build serially and compare every directory total',
+        action='store_true',
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        parser.print_usage()
+        sys.exit()
+
+    start = time.perf_counter()
+    file_tree = parse_parallel(args.file, args.jobs)
+    print(f'Parallel parse: {time.perf_counter() - start:.2f}s')
+
+    if args.check:
+        start = time.perf_counter()
+        serial_tree = build_from_file(args.file, FileTree(), lean=True)
+        print(f'Serial parse: {time.perf_counter() - start:.2f}s')
+        assert [d.get_size() for d in file_tree.walk()] \
+            == [d.get_size() for d in serial_tree.walk()]
+
+    size_index = SizeIndex.from_tree(file_tree)
+    # Total size: 1454188
+    print(
+        'The sum of the size of directories that match is '
+        f'{size_index.sum_at_most(100000)}'
+    )
+    # 4183246
+    print(
+        'Smallest directory that allows for update: '
+        f'{size_index.smallest_to_delete([(MAX_FILE_SPACE, UPDATE_SIZE)])[0]}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/python3
+
+"""
+<https://adventofcode.com/2022/day/7> 'Advent of Code - Day 7'
+
+# Advent of Code 2022 --- Day 7
+
+## Top-k and size histogram report
+
+Reports the k largest directories by total size and by direct size (the files
+listed directly in them), plus a histogram of directory totals in power-of-two
+buckets. The transcript is parsed into a lean `FileTree`, which counts a
+directory listed more than once only once, and its directories are then
+observed one at a time in a single walk. Each top-k list is a min-heap bounded
+at k entries and the histogram has one counter per bit length, so the report
+itself holds O(k + buckets) values however many directories the tree has.
+
+As with `SizeIndex`, the root directory is not itself reported; its total is
+kept as `used_space`.
+"""
+
+import argparse
+import heapq
+import os
+import sys
+
+from ch_1 import FileTree, build
+
+
+class SizeReport():
+    """Class SizeReport keeps the largest directories and a size histogram
+
+    Attributes:
+        count (int): Directories observed
+        histogram (list[int]): histogram[b] counts totals of bit length b,
+          i.e. in [2 ** (b - 1), 2 ** b), with 0 in bucket 0
+        k (int): Entries kept per top-k list
+        top_direct (list[tuple[int, str]]): Min-heap of (direct size, path)
+        top_total (list[tuple[int, str]]): Min-heap of (total, path)
+        used_space (int): Total size of the root directory
+    """
+
+    def __init__(self, k=50):
+        """Constructor
+
+        Args:
+            k (int): Entries kept per top-k list
+        """
+        self.count = 0
+        self.histogram = []
+        self.k = k
+        self.top_direct = []
+        self.top_total = []
+        self.used_space = 0
+
+    @classmethod
+    def from_tree(cls, file_tree, k=50):
+        """Builds a report from every directory in a file tree
+
+        Args:
+            file_tree (FileTree): Parsed tree, lean or not
+            k (int): Entries kept per top-k list
+
+        Returns:
+            SizeReport: New report
+        """
+        report = cls(k)
+        report.used_space = file_tree.root.get_size()
+        paths = {file_tree.root: ''}  # Parents come before their children
+        for node in file_tree.walk():
+            if not node.is_dir():
+                continue
+            path = paths[node] = f'{paths[node.parent]}/{node.file}'
+            direct = node.direct + sum(
+                child.size for child in node.children.values()
+                if not child.is_dir()
+            )
+            report.observe(path, node.get_size(), direct)
+        return report
+
+    @classmethod
+    def from_lines(cls, lines, k=50):
+        """Parses a transcript into a lean tree and reports on it
+
+        Args:
+            lines (Iterable[str]): Transcript lines
+            k (int): Entries kept per top-k list
+
+        Returns:
+            SizeReport: New report
+        """
+        return cls.from_tree(build(lines, FileTree(), lean=True), k)
+
+    def observe(self, path, total, direct):
+        """Adds one directory to the report
+
+        Args:
+            path (str): Directory path
+            total (int): Total size
+            direct (int): Size of the files directly in it
+
+        Returns:
+            self
+        """
+        self.count += 1
+        bucket = total.bit_length()
+        if bucket >= len(self.histogram):
+            self.histogram.extend([0] * (bucket + 1 - len(self.histogram)))
+        self.histogram[bucket] += 1
+        for heap, size in ((self.top_total, total), (self.top_direct, direct)):
+            if len(heap) < self.k:
+                heapq.heappush(heap, (size, path))
+            elif heap and (size, path) > heap[0]:  # Empty when k is 0
+                heapq.heapreplace(heap, (size, path))
+        return self
+
+    def largest_by_total(self):
+        """Returns the kept directories, largest total first
+
+        Returns:
+            list[tuple[int, str]]: (total, path) pairs
+        """
+        return sorted(self.top_total, reverse=True)
+
+    def largest_by_direct(self):
+        """Returns the kept directories, largest direct size first
+
+        Returns:
+            list[tuple[int, str]]: (direct size, path) pairs
+        """
+        return sorted(self.top_direct, reverse=True)
+
+    def buckets(self):
+        """Returns the non-empty histogram buckets
+
+        Returns:
+            list[tuple[int, int, int]]: (low, high, count), counting totals
+              with low <= total < high
+        """
+        return [
+            (1 << bucket >> 1, 1 << bucket, count)
+            for bucket, count in enumerate(self.histogram) if count
+        ]
+
+
+def main():
+    """Parses args, streams the transcript and prints the report"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to input file',
+        default="input.txt",
+    )
+    parser.add_argument(
+        "-k",
+        "--top",
+        help='number of largest directories to list',
+        default=50,
+        type=int,
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file) or args.top < 1:
+        parser.print_usage()
+        sys.exit()
+
+    with open(args.file, encoding='utf8') as file:
+        report = SizeReport.from_lines(file, args.top)
+
+    print(f'{report.count} directories, {report.used_space} used')
+    print(f'Largest {args.top} directories by total size:')
+    for size, path in report.largest_by_total():
+        print(f'{size:12d} {path}')
+    print(f'Largest {args.top} directories by direct size:')
+    for size, path in report.largest_by_direct():
+        print(f'{size:12d} {path}')
+    print('Directory totals:')
+    widest = max((count for _, _, count in report.buckets()), default=1)
+    for low, high, count in report.buckets():
+        bar = '#' * max(count * 40 // widest, 1)
+        print(f'{low:>12d} - {high - 1:<12d} {count:8d} {bar}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+
+"""
+<https://adventofcode.com/2022/day/7> 'Advent of Code - Day 7'
+
+# Advent of Code 2022 --- Day 7
+
+## Single-parse runner
+
+`ch_1.py` and `ch_2.py` each read, parse and build the same tree. This runner
+parses the transcript once with the bytes tokenizer into a lean `FileTree`
+(directory totals are kept current while it is built), collects the totals
+into a `SizeIndex` in one walk, and answers part one, part two and any extra
+thresholds from that index.
+"""
+
+import argparse
+import os
+import sys
+
+from ch_1 import FileTree
+from size_index import MAX_FILE_SPACE, UPDATE_SIZE, SizeIndex
+from tokenizer import build_from_file
+
+
+def solve(file_tree, limits, pairs):
+    """Answers both parts for every threshold from one index
+
+    Args:
+        file_tree (FileTree): Parsed tree
+        limits (list[int]): Part-one size limits
+        pairs (list[tuple[int, int]]): Part-two (disk size, update size) pairs
+
+    Returns:
+        tuple[list[int], list[Union[FileNode, None]]]: Sum of directories of
+          at most each limit, and the smallest directory that frees enough
+          space for each pair (None where none does)
+    """
+    size_index = SizeIndex.from_tree(file_tree)
+    candidates = []
+    for size in size_index.smallest_to_delete(pairs):
+        if size is None:
+            candidates.append(None)
+            continue
+        # Only directories at least as large as the answer are visited
+        candidates.append(next(
+            node for node in file_tree.walk(
+                prune=lambda node: node.get_size() < size
+            )
+            if node.is_dir() and node.get_size() == size
+        ))
+    return size_index.sums_at_most(limits), candidates
+
+
+def main():
+    """Parses args, parses the transcript once and prints every answer"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to input file',
+        default="input.txt",
+    )
+    parser.add_argument(
+        "-l",
+        "--limit",
+        help='extra part-one threshold, may be repeated',
+        action='append',
+        default=[],
+        type=int,
+    )
+    parser.add_argument(
+        "-s",
+        "--space",
+        help='extra (disk size, update size) pair, may be repeated',
+        action='append',
+        default=[],
+        nargs=2,
+        metavar=('DISK', 'UPDATE'),
+        type=int,
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        parser.print_usage()
+        sys.exit()
+
+    file_tree = build_from_file(args.file, FileTree(), lean=True)
+    limits = [100000] + args.limit
+    pairs = [(MAX_FILE_SPACE, UPDATE_SIZE)] + [tuple(p) for p in args.space]
+    totals, candidates = solve(file_tree, limits, pairs)
+    answers = [
+        'none' if candidate is None
+        else f'dir {candidate.file} - {candidate.get_size()}'
+        for candidate in candidates
+    ]
+
+    # Total size: 1454188
+    print(f'The sum of the size of directories that match is {totals[0]}')
+    print('Smallest directory that allows for update:')
+    # dir wvq - 4183246
+    print(answers[0])
+
+    for limit, total in zip(limits[1:], totals[1:]):
+        print(f'Sum of directories of at most {limit}: {total}')
+    for (disk, update), answer in zip(pairs[1:], answers[1:]):
+        print(f'Smallest directory to fit {update} on {disk}: {answer}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/python3
+
+"""
+<https://adventofcode.com/2022/day/7> 'Advent of Code - Day 7'
+
+# Advent of Code 2022 --- Day 7
+
+## Filesystem scanner
+
+Builds a `FileTree` from a real directory instead of a transcript, making the
+day-7 queries a "du and find deletion candidates" tool. Listing a directory is
+dominated by `scandir` and `lstat` calls that release the GIL, so directories
+are listed by a thread pool while the main thread adds the entries to the tree
+(keeping `FileNode.add` and the running totals single-threaded) and queues the
+subdirectories it finds.
+
+Symbolic links are counted as files with their own size and never followed.
+Directories that cannot be listed are reported and counted as empty, and
+entries removed while their directory is listed are skipped.
+
+`--benchmark` also builds the tree from a serial `os.walk` and prints both
+times, and `--generate COUNT` first fills a new directory with COUNT small
+files to scan.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ch_1 import FileNode, FileTree
+from size_index import MAX_FILE_SPACE, UPDATE_SIZE, SizeIndex
+
+
+def list_directory(path):
+    """Lists one directory
+
+    Args:
+        path (str): Directory to list
+
+    Returns:
+        tuple[list[tuple[str, bool, int]], Union[OSError, None]]: (name,
+          is directory, size) of each entry, and the error if it failed
+    """
+    entries = []
+    try:
+        with os.scandir(path) as iterator:
+            for entry in iterator:
+                if entry.is_dir(follow_symlinks=False):
+                    entries.append((entry.name, True, 0))
+                    continue
+                try:
+                    size = entry.stat(follow_symlinks=False).st_size
+                except OSError:  # Removed since it was listed
+                    continue
+                entries.append((entry.name, False, size))
+    except OSError as error:
+        return entries, error
+    return entries, None
+
+
+def scan(path, jobs=32):
+    """Builds a FileTree from a directory using a thread pool
+
+    Args:
+        path (str): Directory to scan, becomes the root
+        jobs (int): Threads listing directories
+
+    Returns:
+        FileTree: Tree with every directory total filled in
+    """
+    file_tree = FileTree()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        pending = {
+            executor.submit(list_directory, path): (path, file_tree.root)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                directory, node = pending.pop(future)
+                entries, error = future.result()
+                if error is not None:
+                    print(f'{directory}: {error.strerror}', file=sys.stderr)
+                for name, is_dir, size in entries:
+                    if is_dir:
+                        child = FileNode(name, directory=True)
+                        node.add(child)
+                        child_path = os.path.join(directory, name)
+                        pending[executor.submit(
+                            list_directory, child_path
+                        )] = (child_path, child)
+                    else:
+                        node.add(FileNode(name, size=size))
+    return file_tree
+
+
+def scan_serial(path):
+    """Builds a FileTree from a directory with a serial os.walk
+
+    Args:
+        path (str): Directory to scan, becomes the root
+
+    Returns:
+        FileTree: Tree with every directory total filled in
+    """
+    file_tree = FileTree()
+    nodes = {path: file_tree.root}
+    for directory, dirnames, filenames in os.walk(path):
+        node = nodes[directory]
+        # os.walk lists symbolic links to directories as directories, but
+        # does not follow them: count them as files, as scan does
+        links = [
+            name for name in dirnames
+            if os.path.islink(os.path.join(directory, name))
+        ]
+        for name in dirnames:
+            if name in links:
+                continue
+            child = FileNode(name, directory=True)
+            node.add(child)
+            nodes[os.path.join(directory, name)] = child
+        for name in filenames + links:
+            try:
+                size = os.lstat(os.path.join(directory, name)).st_size
+            except OSError:  # Removed since it was listed
+                continue
+            node.add(FileNode(name, size=size))
+    return file_tree
+
+
+def generate(path, count, fan_out=100):
+    """Creates a new directory tree of small files for benchmarking
+
+    Args:
+        path (str): Directory to create, must not exist
+        count (int): Number of files
+        fan_out (int): Files per directory and subdirectories per directory
+
+    Returns:
+        str: path
+    """
+    os.makedirs(path)
+    for index in range(count):
+        parts = []
+        number = index // fan_out
+        while number:
+            number, part = divmod(number, fan_out)
+            parts.append(f'd{part}')
+        directory = os.path.join(path, *reversed(parts))
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f'f{index}'), 'wb') as file:
+            file.write(b'x' * (index % 4096))
+    return path
+
+
+def main():
+    """Parses args, scans the directory and prints both results"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "path",
+        help='directory to scan',
+        nargs='?',
+        default=".",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help='threads listing directories',
+        default=32,
+        type=int,
+    )
+    parser.add_argument(
+        "--limit",
+        help='part-one directory size limit',
+        default=100000,
+        type=int,
+    )
+    parser.add_argument(
+        "--disk",
+        help='total disk space for part two',
+        default=MAX_FILE_SPACE,
+        type=int,
+    )
+    parser.add_argument(
+        "--update",
+        help='unused space the update needs for part two',
+        default=UPDATE_SIZE,
+        type=int,
+    )
+    parser.add_argument(
+        "--benchmark",
+        help='also scan with a serial os.walk and compare times',
+        action='store_true',
+    )
+    parser.add_argument(
+        "--generate",
+        help='first create path with this many small files',
+        metavar='COUNT',
+        type=int,
+    )
+    args = parser.parse_args()
+
+    if args.generate:
+        if os.path.exists(args.path):
+            print(f'{args.path} already exists')
+            sys.exit(1)
+        start = time.perf_counter()
+        generate(args.path, args.generate)
+        print(
+            f'Generated {args.generate} files in '
+            f'{time.perf_counter() - start:.2f}s'
+        )
+
+    if not os.path.isdir(args.path):
+        parser.print_usage()
+        sys.exit()
+
+    start = time.perf_counter()
+    file_tree = scan(args.path, args.jobs)
+    print(f'Threaded scandir: {time.perf_counter() - start:.2f}s')
+
+    if args.benchmark:
+        start = time.perf_counter()
+        serial_tree = scan_serial(args.path)
+        print(f'Serial os.walk: {time.perf_counter() - start:.2f}s')
+        assert serial_tree.root.get_size() == file_tree.root.get_size()
+
+    size_index = SizeIndex.from_tree(file_tree)
+    print(f'Used space: {size_index.used_space}')
+    print(
+        f'Sum of directories of at most {args.limit}: '
+        f'{size_index.sum_at_most(args.limit)}'
+    )
+    print(
+        f'Smallest directory to fit {args.update} on {args.disk}: '
+        f'{size_index.smallest_to_delete([(args.disk, args.update)])[0]}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/python3
+
+"""
+<https://adventofcode.com/2022/day/7> 'Advent of Code - Day 7'
+
+# Advent of Code 2022 --- Day 7
+
+## Sorted size index
+
+Directory totals are collected once after parsing, sorted, and paired with
+prefix sums. "Sum of all directories of at most L", "count of directories of
+at least L" and "smallest directory of at least L" are then binary searches
+instead of a walk over the tree per threshold, which makes it cheap to answer
+thousands of thresholds or (disk size, update size) pairs in one call.
+
+As with `FileTree.get_dirs_by_size` and `FileTree.get_dirs_larger_than`, the
+root directory is not itself a candidate; its total is kept as `used_space`.
+"""
+
+import argparse
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+from ch_1 import FileTree, build
+
+MAX_FILE_SPACE = 70000000
+UPDATE_SIZE = 30000000
+
+
+class SizeIndex():
+    """Class SizeIndex answers directory size threshold queries by bisection
+
+    Attributes:
+        prefix (list[int]): prefix[i] is the sum of the i smallest totals
+        sizes (list[int]): Directory totals in ascending order
+        used_space (int): Total size of the root directory
+    """
+
+    def __init__(self, sizes, used_space):
+        """Constructor
+
+        Args:
+            sizes (Iterable[int]): Directory totals, root excluded
+            used_space (int): Total size of the root directory
+        """
+        self.sizes = sorted(sizes)
+        self.prefix = list(accumulate(self.sizes, initial=0))
+        self.used_space = used_space
+
+    @classmethod
+    def from_tree(cls, file_tree):
+        """Builds an index from every directory in a file tree
+
+        Args:
+            file_tree (FileTree): Parsed tree
+
+        Returns:
+            SizeIndex: New index
+        """
+        return cls(
+            (node.get_size() for node in file_tree.walk() if node.is_dir()),
+            file_tree.root.get_size(),
+        )
+
+    def __len__(self):
+        """Returns number of indexed directories"""
+        return len(self.sizes)
+
+    def sum_at_most(self, limit):
+        """Returns the sum of every directory total up to limit
+
+        Args:
+            limit (int): Largest total to include
+
+        Returns:
+            int: Sum of matching totals
+        """
+        return self.prefix[bisect_right(self.sizes, limit)]
+
+    def count_at_least(self, limit):
+        """Returns the number of directories with a total of at least limit
+
+        Args:
+            limit (int): Smallest total to count
+
+        Returns:
+            int: Number of matching directories
+        """
+        return len(self.sizes) - bisect_left(self.sizes, limit)
+
+    def smallest_at_least(self, limit):
+        """Returns the smallest directory total of at least limit
+
+        Args:
+            limit (int): Smallest acceptable total
+
+        Returns:
+            Union[int, None]: Matching total or None if no directory is large
+              enough
+        """
+        index = bisect_left(self.sizes, limit)
+        if index == len(self.sizes):
+            return None
+        return self.sizes[index]
+
+    def space_needed(self, disk_size, update_size):
+        """Returns how much must be deleted to fit an update
+
+        Args:
+            disk_size (int): Total disk space
+            update_size (int): Unused space the update requires
+
+        Returns:
+            int: Space to free, 0 if the update already fits
+        """
+        return max(update_size - (disk_size - self.used_space), 0)
+
+    def sums_at_most(self, limits):
+        """Batch form of `sum_at_most`
+
+        Args:
+            limits (Iterable[int]): Thresholds
+
+        Returns:
+            list[int]: Sum of matching totals for each threshold
+        """
+        return [self.sum_at_most(limit) for limit in limits]
+
+    def counts_at_least(self, limits):
+        """Batch form of `count_at_least`
+
+        Args:
+            limits (Iterable[int]): Thresholds
+
+        Returns:
+            list[int]: Number of matching directories for each threshold
+        """
+        return [self.count_at_least(limit) for limit in limits]
+
+    def smallest_to_delete(self, pairs):
+        """Returns the smallest deletable directory for each disk and update
+
+        Args:
+            pairs (Iterable[tuple[int, int]]): (disk size, update size) pairs
+
+        Returns:
+            list[Union[int, None]]: Smallest sufficient directory total for
+              each pair, None where no directory frees enough space
+        """
+        return [
+            self.smallest_at_least(self.space_needed(disk_size, update_size))
+            for disk_size, update_size in pairs
+        ]
+
+
+def main():
+    """Parses args, indexes directory totals and answers every query"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to input file',
+        default="input.txt",
+    )
+    parser.add_argument(
+        "-l",
+        "--limit",
+        help='extra part-one threshold, may be repeated',
+        action='append',
+        default=[],
+        type=int,
+    )
+    parser.add_argument(
+        "-s",
+        "--space",
+        help='extra (disk size, update size) pair, may be repeated',
+        action='append',
+        default=[],
+        nargs=2,
+        metavar=('DISK', 'UPDATE'),
+        type=int,
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        parser.print_usage()
+        sys.exit()
+
+    with open(args.file, encoding='utf8') as file:
+        size_index = SizeIndex.from_tree(build(file, FileTree()))
+
+    limits = [100000] + args.limit
+    pairs = [(MAX_FILE_SPACE, UPDATE_SIZE)] + [tuple(p) for p in args.space]
+
+    # At most 100000: 1454188
+    for limit, total in zip(limits, size_index.sums_at_most(limits)):
+        print(f'Sum of directories of at most {limit}: {total}')
+    # 30000000 update on 70000000 disk: 4183246
+    for (disk, update), size in zip(
+        pairs, size_index.smallest_to_delete(pairs)
+    ):
+        print(f'Smallest directory to fit {update} on {disk}: {size}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/python3
+
+"""
+<https://adventofcode.com/2022/day/7> 'Advent of Code - Day 7'
+
+# Advent of Code 2022 --- Day 7
+
+## Binary snapshots
+
+Saves a parsed `CompactFileTree` to a binary snapshot and reloads it through
+`mmap`, so a transcript only has to be parsed once. The snapshot holds the
+node arrays (with directory totals already summed into `size`), and the name
+table as an offset array into one UTF-8 blob. Every section starts on an
+8-byte boundary.
+
+```
+header    magic, version, node count, name count, blob length, source size,
+          source mtime (ns), source path length
+source    UTF-8 absolute path of the transcript
+size      int64   x nodes
+parent    int32   x nodes
+first     int32   x nodes
+next      int32   x nodes
+name      int32   x nodes
+directory uint8   x nodes
+offsets   int64   x (names + 1)
+blob      bytes
+```
+
+Numbers are stored in native byte order. Loading casts `memoryview` slices of
+the mapping straight to typed arrays, so nothing is copied or decoded up front
+and the load time does not depend on the tree size. `SnapshotTree` runs the
+`CompactFileTree` queries (`walk`, `crawl`, `get_dirs_by_size`,
+`get_dirs_larger_than`, `cd`, `ls`, `pwd`) on the mapped data and decodes
+names only when asked for them.
+
+The header records the transcript a snapshot was written from, and `main`
+rewrites the snapshot when the transcript given with `--file` is a different
+file or has changed since.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+from compact_tree import NO_NODE, CompactFileTree
+from size_index import MAX_FILE_SPACE, UPDATE_SIZE
+from tokenizer import build_records, iter_lines, iter_records, map_file
+
+MAGIC = b'AOC7SNAP'
+VERSION = 2
+HEADER = struct.Struct('=8sIQQQQqQ')
+ARRAYS = (
+    ('size', 'q'),
+    ('parent', 'i'),
+    ('first_child', 'i'),
+    ('next_sibling', 'i'),
+    ('name', 'i'),
+    ('directory', 'B'),
+)
+
+
+def padding(offset):
+    """Returns the bytes needed to reach the next 8-byte boundary"""
+    return -offset % 8
+
+
+def get_source(file_path):
+    """Identifies a transcript by its absolute path, size and mtime
+
+    Args:
+        file_path (str): Transcript
+
+    Returns:
+        tuple[str, int, int]: (absolute path, size, mtime in nanoseconds)
+    """
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+
+def read_source(path):
+    """Reads which transcript a snapshot was written from
+
+    Args:
+        path (str): Snapshot file
+
+    Returns:
+        Union[tuple[str, int, int], None]: See `get_source`, None if path is
+          not a snapshot of this version
+    """
+    with open(path, 'rb') as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return None
+        magic, version, _, _, _, size, mtime, length = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            return None
+        return file.read(length).decode(), size, mtime
+
+
+def write_snapshot(compact_tree, path, source=('', 0, 0)):
+    """Writes a CompactFileTree to a binary snapshot
+
+    Args:
+        compact_tree (CompactFileTree): Parsed tree
+        path (str): Destination file
+        source (tuple[str, int, int]): Transcript it was parsed from, see
+          `get_source`
+
+    Returns:
+        int: Bytes written
+    """
+    compact_tree.compute_sizes()
+    encoded = [name.encode() for name in compact_tree.names]
+    offsets = array('q', [0])
+    for name in encoded:
+        offsets.append(offsets[-1] + len(name))
+    source_path = source[0].encode()
+
+    with open(path, 'wb') as file:
+        written = file.write(HEADER.pack(
+            MAGIC, VERSION, len(compact_tree), len(encoded), offsets[-1],
+            source[1], source[2], len(source_path)
+        ))
+        written += file.write(source_path)
+        for section in [getattr(compact_tree, a) for a, _ in ARRAYS] \
+                + [offsets]:
+            written += file.write(b'\0' * padding(written))
+            written += file.write(section.tobytes())
+        written += file.write(b''.join(encoded))
+    return written
+
+
+class NameTable():
+    """Class NameTable decodes names from a snapshot blob on demand
+
+    Attributes:
+        blob (memoryview): UTF-8 names back to back
+        offsets (memoryview): Start of each name in blob, plus the end
+    """
+
+    def __init__(self, offsets, blob):
+        """Constructor
+
+        Args:
+            offsets (memoryview): Start of each name in blob, plus the end
+            blob (memoryview): UTF-8 names back to back
+        """
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        """Returns number of names"""
+        return len(self.offsets) - 1
+
+    def __getitem__(self, name_id):
+        """Returns a decoded name"""
+        start, stop = self.offsets[name_id], self.offsets[name_id + 1]
+        return bytes(self.blob[start:stop]).decode()
+
+
+class SnapshotTree(CompactFileTree):
+    """Class SnapshotTree is a read-only CompactFileTree over a mapped
+    snapshot
+
+    Attributes:
+        mapping (mmap.mmap): Mapped snapshot file
+        source (tuple[str, int, int]): Transcript it was written from, see
+          `get_source`
+    """
+
+    def __init__(self, path):
+        """Constructor
+
+        Args:
+            path (str): Snapshot file
+        """
+        with open(path, 'rb') as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = self._view = memoryview(self.mapping)
+        magic, version, nodes, names, blob, size, mtime, length = \
+            HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a day-7 snapshot')
+
+        offset = HEADER.size + length
+        self.source = (
+            bytes(view[HEADER.size:offset]).decode(), size, mtime
+        )
+        for attribute, code in ARRAYS + (('offsets', 'q'),):
+            offset += padding(offset)
+            count = names + 1 if attribute == 'offsets' else nodes
+            length = count * struct.calcsize(code)
+            setattr(self, attribute, view[offset:offset + length].cast(code))
+            offset += length
+
+        self.names = NameTable(self.offsets, view[offset:offset + blob])
+        self._stale = False
+        self.root = 0
+        self.cwd = self.root
+        self._cwd_names = None
+
+    def close(self):
+        """Releases the mapping; the tree cannot be used afterwards"""
+        for attribute, _ in ARRAYS + (('offsets', 'q'),):
+            getattr(self, attribute).release()
+        self.names.blob.release()
+        self._view.release()
+        self.mapping.close()
+
+    def add(self, obj):
+        """Snapshots are read-only
+
+        Returns:
+            None
+        """
+        print('snapshot is read-only')
+        return None
+
+    def cd(self, path):
+        """Changes current working directory (cwd), scanning the directory's
+        children since a snapshot keeps no lookup table
+
+        Args:
+            path (str): Target directory
+
+        Returns
+            self
+        """
+        if path in ('..', '/'):
+            return super().cd(path)
+
+        child = self.first_child[self.cwd]
+        while child != NO_NODE:
+            if self.directory[child] and self.names[self.name[child]] == path:
+                self.cwd = child
+                return self
+            child = self.next_sibling[child]
+        print(f'{path} is not a valid directory')
+        return self
+
+
+def main():
+    """Parses args, loads or writes a snapshot and prints both results"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to input file',
+        default="input.txt",
+    )
+    parser.add_argument(
+        "-s",
+        "--snapshot",
+        help='snapshot to load, written from --file if missing or stale',
+        default="input.snap",
+    )
+    parser.add_argument(
+        "--rebuild",
+        help='rewrite the snapshot even if it exists',
+        action='store_true',
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        parser.print_usage()
+        sys.exit()
+
+    source = get_source(args.file)
+    if args.rebuild or not os.path.exists(args.snapshot) \
+            or read_source(args.snapshot) != source:
+        start = time.perf_counter()
+        buffer = map_file(args.file)
+        compact_tree = build_records(
+            iter_records(iter_lines(buffer)), CompactFileTree()
+        )
+        if not isinstance(buffer, bytes):
+            buffer.close()
+        written = write_snapshot(compact_tree, args.snapshot, source)
+        print(
+            f'Wrote {written} bytes to {args.snapshot} in '
+            f'{time.perf_counter() - start:.3f}s'
+        )
+
+    start = time.perf_counter()
+    snapshot = SnapshotTree(args.snapshot)
+    print(f'Loaded {args.snapshot} in {time.perf_counter() - start:.6f}s')
+
+    dirs = snapshot.get_dirs_by_size(100000)
+    # Total size: 1454188
+    print(
+        'The sum of the size of directories that match is '
+        f'{sum(d.get_size() for d in dirs)}'
+    )
+
+    space_needed = max(UPDATE_SIZE - (MAX_FILE_SPACE - snapshot.size[0]), 0)
+    smallest_candidate = min(
+        snapshot.get_dirs_larger_than(space_needed),
+        key=lambda d: d.get_size(),
+        default=None,
+    )
+    print('Smallest directory that allows for update:')
+    # dir wvq - 4183246
+    if smallest_candidate is None:
+        print('none')
+    else:
+        print(
+            f'dir {smallest_candidate.file} - '
+            f'{smallest_candidate.get_size()}'
+        )
+
+
+if __name__ == '__main__':
+    main()
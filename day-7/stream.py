@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+
+"""
+<https://adventofcode.com/2022/day/7> 'Advent of Code - Day 7'
+
+# Advent of Code 2022 --- Day 7
+
+## Streaming directory totals
+
+Answers both parts without building a `FileTree`. Transcript lines are read
+lazily and drive a stack holding one running total per open directory: a size
+line adds to the top of the stack, `$ cd x` pushes, `$ cd ..` pops and folds
+the closed total into its parent, and `$ cd /` closes everything but the root.
+Memory is proportional to directory depth, not to the number of files.
+`iter_dir_totals(lines, direct=True)` also reports the size of the files listed
+directly in each directory, which `report.py` builds on.
+
+Every directory is assumed to be entered once, as in the puzzle input. A
+directory that is entered again is reported again with only the sizes listed
+on that visit.
+
+Part two needs the total used space before it can choose a directory, so the
+transcript is streamed twice: once to sum file sizes and once for the totals.
+"""
+
+import argparse
+import os
+import sys
+
+MAX_FILE_SPACE = 70000000
+UPDATE_SIZE = 30000000
+
+
+def iter_dir_totals(lines, direct=False):
+    """Yields the total size of each directory as it is closed
+
+    Args:
+        lines (Iterable[str]): Transcript lines, consumed lazily
+        direct (bool): Also yield the size of the files directly in each
+          directory
+
+    Yields:
+        Union[tuple[str, int], tuple[str, int, int]]: Directory path and
+          total size (and direct size), root ('/') last
+    """
+    names = ['']
+    totals = [0]
+    directs = [0]
+
+    def close():
+        total = totals.pop()
+        path = '/'.join(names) or '/'
+        names.pop()
+        totals[-1] += total
+        size = directs.pop()
+        if direct:
+            return path, total, size
+        return path, total
+
+    for line in lines:
+        tokens = line.split()
+
+        if len(tokens) == 0:  # Blank line
+            continue
+
+        if tokens[0] == '$' and tokens[1] == 'cd':  # Change directory
+            if tokens[2] == '..':
+                if len(totals) > 1:
+                    yield close()
+            elif tokens[2] == '/':
+                while len(totals) > 1:
+                    yield close()
+            else:
+                names.append(tokens[2])
+                totals.append(0)
+                directs.append(0)
+
+        elif tokens[0].isdigit():  # Add file listed in input
+            size = int(tokens[0])
+            totals[-1] += size
+            directs[-1] += size
+
+    while len(totals) > 1:
+        yield close()
+    if direct:
+        yield '/', totals[0], directs[0]
+    else:
+        yield '/', totals[0]
+
+
+def get_used_space(lines):
+    """Returns the sum of every file size in a transcript
+
+    Args:
+        lines (Iterable[str]): Transcript lines, consumed lazily
+
+    Returns:
+        int: Total used space
+    """
+    used_space = 0
+    for line in lines:
+        size = line.split(' ', 1)[0]
+        if size.isdigit():
+            used_space += int(size)
+    return used_space
+
+
+def main():
+    """Parses args, streams the transcript and prints both results"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to input file',
+        default="input.txt",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        help='print every directory total as it is closed',
+        action='store_true',
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        parser.print_usage()
+        sys.exit()
+
+    with open(args.file, encoding='utf8') as file:
+        used_space = get_used_space(file)
+
+    space_needed = max(UPDATE_SIZE - (MAX_FILE_SPACE - used_space), 0)
+    total_size = 0
+    smallest_candidate = None
+
+    with open(args.file, encoding='utf8') as file:
+        for path, size in iter_dir_totals(file):
+            if args.verbose:
+                print(f'{size} {path}')
+            if path == '/':  # Root is not a candidate for either part
+                continue
+            if size <= 100000:
+                total_size += size
+            if size >= space_needed and (
+                smallest_candidate is None or size < smallest_candidate[1]
+            ):
+                smallest_candidate = (path, size)
+
+    # Total size: 1454188
+    print(f'The sum of the size of directories that match is {total_size}')
+    print('Smallest directory that allows for update:')
+    if smallest_candidate is None:
+        print('none')
+    else:
+        print(f'dir {smallest_candidate[0]} - {smallest_candidate[1]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/python3
+
+"""
+<https://adventofcode.com/2022/day/7> 'Advent of Code - Day 7'
+
+# Advent of Code 2022 --- Day 7
+
+## Subtree index
+
+Scoped questions such as "which directories under /cmvqf/dcgbjvj are between
+X and Y bytes" otherwise mean `cd`-ing to the directory and crawling it. This
+index lays the `FileTree` out in depth-first (enter) order once, recording
+where each node's subtree ends, so every subtree is a contiguous range of
+positions:
+
+- subtree file count is a difference of prefix sums (and subtree size is the
+  directory's running total),
+- the directories under a node are a contiguous slice of a precomputed list of
+  directory totals, filtered without touching any `FileNode`,
+- directory paths map straight to their position, so `/a/b/c` resolves with
+  one lookup instead of repeated `FileTree.cd` calls.
+
+The index is a snapshot; build a new one after the tree changes. A lean tree
+keeps no file nodes, so file counts are refused where files were folded.
+"""
+
+import argparse
+import os
+import sys
+from bisect import bisect_left
+from itertools import accumulate
+
+from ch_1 import FileTree, build
+
+
+class SubtreeIndex():
+    """Class SubtreeIndex stores every FileTree subtree as a position range
+
+    Attributes:
+        dir_paths (list[str]): Path of each directory, in tour order
+        dir_positions (list[int]): Tour position of each directory
+        dir_totals (list[int]): Total size of each directory, in tour order
+        end (list[int]): Position just past the last descendant of each node
+        file_counts (list[int]): file_counts[i] is the number of files before
+          position i
+        folded (list[int]): folded[i] is the number of directories with
+          folded files (lean trees) before position i
+        nodes (list[FileNode]): Every node in tour order, root first
+        paths (dict[str, int]): Directory path to tour position
+    """
+
+    def __init__(self, file_tree):
+        """Constructor
+
+        Args:
+            file_tree (FileTree): Parsed tree to index
+        """
+        file_tree.compute_sizes()
+        self.nodes = []
+        self.end = []
+        self.paths = {}
+        self.dir_paths = []
+        self.dir_positions = []
+        self.dir_totals = []
+
+        stack = [(file_tree.root, '', False)]
+        while stack:
+            node, path, visited = stack.pop()
+            if visited:  # Every descendant has been entered
+                self.end[self.paths[path or '/']] = len(self.nodes)
+                continue
+
+            position = len(self.nodes)
+            self.nodes.append(node)
+            self.end.append(position + 1)
+            if node.is_dir():
+                self.paths[path or '/'] = position
+                self.dir_paths.append(path or '/')
+                self.dir_positions.append(position)
+                self.dir_totals.append(node.get_size())
+                stack.append((node, path, True))
+                for child in reversed(node.children.values()):
+                    stack.append((child, f'{path}/{child.file}', False))
+
+        self.file_counts = list(accumulate(
+            (0 if node.is_dir() else 1 for node in self.nodes),
+            initial=0,
+        ))
+        self.folded = list(accumulate(
+            (1 if node.is_dir() and node.direct else 0 for node in self.nodes),
+            initial=0,
+        ))
+
+    def locate(self, path):
+        """Returns the tour position of a path
+
+        Args:
+            path (str): Absolute path such as '/a/b/c'
+
+        Returns:
+            Union[int, None]: Tour position or None if the path is unknown
+        """
+        path = '/' + path.strip('/')
+        position = self.paths.get(path)
+        if position is None and path != '/':  # Maybe a file
+            parent, _, file = path.rpartition('/')
+            directory = self.paths.get(parent or '/')
+            node = directory is not None \
+                and self.nodes[directory].get_file(file)
+            if node:
+                position = self._child_position(directory, node)
+        return position
+
+    def _require(self, path):
+        """Returns the tour position of a path that must exist
+
+        Raises:
+            ValueError: If the path is unknown
+        """
+        position = self.locate(path)
+        if position is None:
+            raise ValueError(f'{path} is not a valid path')
+        return position
+
+    def _child_position(self, directory, node):
+        """Returns the tour position of a child of a directory"""
+        position = directory + 1
+        while self.nodes[position] is not node:
+            position = self.end[position]  # Skip sibling's subtree
+        return position
+
+    def resolve(self, path):
+        """Returns the FileNode at a path
+
+        Args:
+            path (str): Absolute path such as '/a/b/c'
+
+        Returns:
+            Union[FileNode, None]: Matching node or None
+        """
+        position = self.locate(path)
+        if position is None:
+            return None
+        return self.nodes[position]
+
+    def subtree_size(self, path):
+        """Returns the total size of every file under a path
+
+        Args:
+            path (str): Absolute path
+
+        Returns:
+            int: Total size (file size for a file)
+
+        Raises:
+            ValueError: If the path is unknown
+        """
+        return self.nodes[self._require(path)].get_size()
+
+    def subtree_file_count(self, path):
+        """Returns the number of files under a path
+
+        Args:
+            path (str): Absolute path
+
+        Returns:
+            int: Number of files (1 for a file)
+
+        Raises:
+            ValueError: If the path is unknown, or files under it were folded
+              into their directories by a lean tree
+        """
+        position = self._require(path)
+        if self.folded[self.end[position]] != self.folded[position]:
+            raise ValueError(f'{path} holds folded files, count unknown')
+        return self.file_counts[self.end[position]] \
+            - self.file_counts[position]
+
+    def get_dirs_in_range(self, path, low, high):
+        """Returns directories strictly below path with a total in range
+
+        Args:
+            path (str): Absolute path of the directory to search under
+            low (int): Smallest total to include
+            high (int): Largest total to include
+
+        Returns:
+            list[tuple[str, int]]: (path, total) of each matching directory
+
+        Raises:
+            ValueError: If the path is unknown
+        """
+        position = self._require(path)
+        start = bisect_left(self.dir_positions, position + 1)
+        stop = bisect_left(self.dir_positions, self.end[position])
+        return [
+            (self.dir_paths[index], self.dir_totals[index])
+            for index in range(start, stop)
+            if low <= self.dir_totals[index] <= high
+        ]
+
+
+def main():
+    """Parses args, indexes the tree and prints a scoped directory report"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to input file',
+        default="input.txt",
+    )
+    parser.add_argument(
+        "-p",
+        "--path",
+        help='directory to search under',
+        default="/",
+    )
+    parser.add_argument(
+        "--min",
+        help='smallest directory total to report',
+        default=0,
+        type=int,
+    )
+    parser.add_argument(
+        "--max",
+        help='largest directory total to report',
+        default=100000,
+        type=int,
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        parser.print_usage()
+        sys.exit()
+
+    with open(args.file, encoding='utf8') as file:
+        subtree_index = SubtreeIndex(build(file, FileTree()))
+
+    if subtree_index.locate(args.path) is None:
+        print(f'{args.path} is not a valid path')
+        sys.exit(1)
+
+    dirs = subtree_index.get_dirs_in_range(args.path, args.min, args.max)
+    for path, size in dirs:
+        print(f'{size} {path}')
+
+    print(f'Size of {args.path}: {subtree_index.subtree_size(args.path)}')
+    print(f'Files: {subtree_index.subtree_file_count(args.path)}')
+    # Total for / between 0 and 100000: 1454188
+    print(f'Total of matching directories: {sum(s for _, s in dirs)}')
+
+
+if __name__ == '__main__':
+    main()
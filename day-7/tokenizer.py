@@ -0,0 +1,228 @@
+#!/usr/bin/python3
+
+"""
+<https://adventofcode.com/2022/day/7> 'Advent of Code - Day 7'
+
+# Advent of Code 2022 --- Day 7
+
+## Bytes-level tokenizer
+
+`build` in `ch_1.py` reads the whole transcript with `readlines()`, decodes
+it, splits every line and runs a regular expression on the first token. This
+tokenizer instead walks a memory-mapped file line by line as bytes and
+classifies each line by its first byte:
+
+- `$` is a command, `$ cd <name>` or `$ ls`,
+- `d` is a `dir <name>` entry,
+- a digit starts a `<size> <name>` entry, whose size is parsed with `int()`
+  straight from the bytes before the space.
+
+Only names are decoded, and records feed the tree's `cd`, `add` and `fold`
+directly.
+
+Running this file builds the tree both ways and prints the throughput of
+each in MB/s.
+"""
+
+import argparse
+import io
+import mmap
+import os
+import re
+import sys
+import time
+
+from ch_1 import FileNode, FileTree, build
+
+CD = 'cd'
+DIR = 'dir'
+FILE = 'file'
+LS = 'ls'
+
+DOLLAR = ord('$')
+LETTER_D = ord('d')
+ZERO = ord('0')
+NINE = ord('9')
+CD_PREFIX = b'$ cd '
+LS_COMMAND = b'$ ls'
+
+
+def map_file(path):
+    """Returns a read-only memory map of a file (empty bytes if empty)
+
+    Args:
+        path (str): Path to file
+
+    Returns:
+        Union[mmap.mmap, bytes]: Mapped file contents
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_lines(buffer, start=0, stop=None):
+    """Yields lines of a bytes-like buffer without their line endings
+
+    Args:
+        buffer (Union[bytes, mmap.mmap]): Transcript contents
+        start (int): Offset of first line
+        stop (int): Offset to stop before, defaults to the end of buffer
+
+    Yields:
+        bytes: Each line
+    """
+    reader = buffer if isinstance(buffer, mmap.mmap) else io.BytesIO(buffer)
+    reader.seek(start)
+    if stop is None:
+        for line in iter(reader.readline, b''):
+            yield line.rstrip(b'\r\n')
+        return
+    while reader.tell() < stop:
+        yield reader.readline().rstrip(b'\r\n')
+
+
+def iter_records(lines, file_names=True):
+    """Classifies transcript lines by their first byte
+
+    Args:
+        lines (Iterable[bytes]): Transcript lines without line endings
+        file_names (bool): Decode file names; when False FILE records carry
+          None as their name
+
+    Yields:
+        tuple[str, Union[str, None], Union[int, None]]: (CD, name, None),
+          (LS, None, None), (DIR, name, None) or (FILE, name, size)
+    """
+    for line in lines:
+        if not line:  # Blank line
+            continue
+        first = line[0]
+        if first == DOLLAR:
+            if line.startswith(CD_PREFIX):
+                yield CD, line[5:].decode(), None
+            elif line.rstrip() == LS_COMMAND:
+                yield LS, None, None
+        elif first == LETTER_D:
+            yield DIR, line[4:].decode(), None
+        elif ZERO <= first <= NINE:
+            space = line.index(b' ')
+            yield (
+                FILE,
+                line[space + 1:].decode() if file_names else None,
+                int(line[:space]),
+            )
+
+
+def build_records(records, file_tree, lean=False):
+    """Executes transcript records against a file tree
+
+    Args:
+        records (Iterable[tuple[str, Union[str, int]]]): From `iter_records`
+        file_tree (FileTree): Tree to fill (any object with `cd` and `add`)
+        lean (bool): Fold file sizes into their directory instead of adding
+          file nodes, and intern directory names
+
+    Returns:
+        FileTree: The filled tree
+    """
+    for kind, name, size in records:
+        if kind is FILE:
+            if lean:
+                file_tree.fold(size)
+            else:
+                file_tree.add(FileNode(name, size=size))
+        elif kind is DIR:
+            file_tree.add(FileNode(
+                sys.intern(name) if lean else name, directory=True
+            ))
+        elif kind is CD:
+            file_tree.cd(name)
+        elif lean:  # LS starts a new listing
+            file_tree.end_listing()
+    return file_tree
+
+
+def build_from_file(path, file_tree, lean=False):
+    """Memory-maps a transcript and executes it against a file tree
+
+    Args:
+        path (str): Path to transcript
+        file_tree (FileTree): Tree to fill
+        lean (bool): See `build_records`
+
+    Returns:
+        FileTree: The filled tree
+    """
+    buffer = map_file(path)
+    try:
+        records = iter_records(iter_lines(buffer), file_names=not lean)
+        return build_records(records, file_tree, lean=lean)
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+
+def main():
+    """Parses args, builds the tree both ways and prints throughput"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-f",
+        "--file",
+        help='path to input file',
+        default="input.txt",
+    )
+    parser.add_argument(
+        "--lean",
+        help='keep only directory nodes, folding file sizes into them',
+        action='store_true',
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        parser.print_usage()
+        sys.exit()
+
+    megabytes = os.path.getsize(args.file) / 1e6
+
+    start = time.perf_counter()
+    with open(args.file, encoding='utf8') as file:
+        for line in file.readlines():
+            tokens = line.split()
+            if tokens and re.match(r'^\d+$', tokens[0]):
+                int(tokens[0])
+    split_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    buffer = map_file(args.file)
+    for _ in iter_records(iter_lines(buffer)):
+        pass
+    if isinstance(buffer, mmap.mmap):
+        buffer.close()
+    record_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open(args.file, encoding='utf8') as file:
+        file_tree = build(file.readlines(), FileTree(), lean=args.lean)
+    line_seconds = time.perf_counter() - start
+    line_total = sum(d.get_size() for d in file_tree.get_dirs_by_size(100000))
+    del file_tree  # Keep the first tree from slowing the second build
+
+    start = time.perf_counter()
+    file_tree = build_from_file(args.file, FileTree(), lean=args.lean)
+    byte_seconds = time.perf_counter() - start
+    byte_total = sum(d.get_size() for d in file_tree.get_dirs_by_size(100000))
+    assert line_total == byte_total
+
+    print('Tokenizing only (MB/s):')
+    print(f'  readlines + split + re.match: {megabytes / split_seconds:.1f}')
+    print(f'  mmap + first-byte tokenizer: {megabytes / record_seconds:.1f}')
+    print('Tokenizing and building the FileTree (MB/s):')
+    print(f'  readlines + split + re.match: {megabytes / line_seconds:.1f}')
+    print(f'  mmap + first-byte tokenizer: {megabytes / byte_seconds:.1f}')
+    print(f'The sum of the size of directories that match is {byte_total}')
+
+
+if __name__ == '__main__':
+    main()